@@ -1,6 +1,14 @@
+import django
 from django.apps import AppConfig
+from django.core.signals import request_started
 from django.utils.translation import ugettext_lazy as _
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        import core.signals  # noqa: F401
+        if django.VERSION < (4, 1):
+            from core.db import check_connection_health
+            request_started.connect(check_connection_health)
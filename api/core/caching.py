@@ -0,0 +1,151 @@
+import time
+from contextlib import nullcontext
+from functools import partial, wraps
+from hashlib import sha1
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+from core.replicas import primary_reads
+
+NAMESPACE_KEY = 'core:namespace:{}'
+RESPONSE_KEY = 'core:response:{}'
+
+
+def get_namespace_versions(namespaces):
+    '''Returns {namespace: (timestamp, token)}, starting missing ones now.'''
+    keys = {NAMESPACE_KEY.format(namespace): namespace for namespace in namespaces}
+    versions = cache.get_many(keys)
+    missing = {key: (time.time(), uuid4().hex) for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def get_last_modified(*timestamps):
+    '''Whole-second Last-Modified for `timestamps`, or None while unsafe.
+
+    HTTP dates drop the fraction, so a date handed out during the second of
+    the latest change would still match after another change in that same
+    second. Only offer one once that second is over.
+    '''
+    last_modified = int(max(timestamps))
+    if last_modified >= int(time.time()):
+        return None
+    return last_modified
+
+
+def bump(*namespaces):
+    '''Invalidates every cached response that depends on the namespaces.'''
+    cache.set_many(
+        {
+            NAMESPACE_KEY.format(namespace): (time.time(), uuid4().hex)
+            for namespace in namespaces
+        },
+        timeout=None,
+    )
+
+
+def get_cached_response(view, request, namespaces, handler, *args, **kwargs):
+    '''Serves `handler` from the response cache for anonymous GET requests.
+
+    Namespaces may use the view's URL kwargs, e.g. `'question:{pk}'`. The
+    cache key and ETag embed the current version of each namespace, so
+    `bump` invalidates them without knowing which keys exist.
+
+    Views can add a version of their own with `get_cache_version`, which
+    returns a `(token, timestamp)` pair. Authenticated users of such views
+    also get per-user ETags and 304s, but their responses aren't cached.
+    '''
+    if request.method not in ('GET', 'HEAD'):
+        return handler(request, *args, **kwargs)
+    get_version = getattr(view, 'get_cache_version', None)
+    own_version = get_version() if get_version is not None else None
+    authenticated = request.user.is_authenticated
+    if authenticated and own_version is None:
+        return handler(request, *args, **kwargs)
+    names = sorted(namespace.format(**view.kwargs) for namespace in namespaces)
+    versions = get_namespace_versions(names)
+    timestamps = [version[0] for version in versions.values()]
+    parts = [f'{name}={versions[name][1]}' for name in names]
+    if own_version is not None:
+        parts.append(f'version={own_version[0]}')
+        timestamps.append(own_version[1])
+    if authenticated:
+        parts.append(f'user={request.user.pk}')
+    # Serialized URLs are absolute, so the scheme and host are part of it.
+    fingerprint = sha1('\n'.join([
+        request.scheme,
+        request.get_host(),
+        request.path,
+        '&'.join(sorted(request.META.get('QUERY_STRING', '').split('&'))),
+        str(request.version),
+        request.accepted_renderer.format,
+        *parts,
+    ]).encode()).hexdigest()
+    etag = quote_etag(fingerprint)
+    last_modified = get_last_modified(*timestamps)
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if not_modified is not None:
+        patch_vary_headers(not_modified, ['Authorization'])
+        return not_modified
+    key = RESPONSE_KEY.format(fingerprint)
+    data = None if authenticated else cache.get(key)
+    if data is None:
+        # Replicas may still lag behind the write that caused a recent bump;
+        # filling from one would cache the old rows under the new version.
+        if time.time() - max(timestamps) < settings.REPLICA_PIN_SECONDS:
+            reads = primary_reads()
+        else:
+            reads = nullcontext()
+        with reads:
+            response = handler(request, *args, **kwargs)
+        if not isinstance(response, Response) or response.status_code != 200:
+            return response
+        if not authenticated:
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def cache_response(*namespaces):
+    '''Decorates a view action with `get_cached_response`.'''
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            handler = partial(method, view)
+            return get_cached_response(
+                view, request, namespaces, handler, *args, **kwargs
+            )
+        return wrapper
+    return decorator
+
+
+class CachedResponseMixin:
+    '''Caches `list` and `retrieve` under the view's `cache_namespaces`.'''
+    cache_namespaces = ()
+
+    def get_cache_version(self):
+        '''Optional `(token, timestamp)` the cached responses depend on.'''
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return get_cached_response(
+            self, request, self.cache_namespaces, super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return get_cached_response(
+            self, request, self.cache_namespaces, super().retrieve,
+            *args, **kwargs
+        )
@@ -0,0 +1,16 @@
+from django.db import connections
+
+
+def check_connection_health(**kwargs):
+    '''Closes persistent connections that stopped working.
+
+    Connected to `request_started`, after Django has closed expired
+    connections, for databases with `CONN_HEALTH_CHECKS`. A connection
+    dropped by the server or a pooler between requests is then reopened
+    instead of failing the request. Django 4.1 does this itself.
+    '''
+    for connection in connections.all():
+        if (connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and connection.connection is not None
+                and not connection.is_usable()):
+            connection.close()
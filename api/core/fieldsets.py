@@ -0,0 +1,110 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import HyperlinkedIdentityField
+
+
+def split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def flatten(select_related, prefix=''):
+    '''Turns `query.select_related` back into `select_related()` lookups.'''
+    for name, nested in select_related.items():
+        yield prefix + name
+        yield from flatten(nested, f'{prefix}{name}__')
+
+
+class SparseFieldsetMixin:
+    '''Lets GET clients pick fields with `?fields=a,b` or `?omit=c`.
+
+    Unselected fields are dropped from the serializer, and the queryset is
+    narrowed with `.only()` so their columns and relations are never read.
+    Serializers map fields that aren't model fields (properties, method
+    fields) to the columns they read with `Meta.field_sources`; without an
+    entry such a field disables the narrowing.
+    '''
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        '''The set of selected field names, or None to keep them all.'''
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+        self._sparse_fields = None
+        params = self.request.query_params
+        fields = split(params.get(self.fields_query_param, ''))
+        omit = split(params.get(self.omit_query_param, ''))
+        if self.request.method not in ('GET', 'HEAD') or not (fields or omit):
+            return None
+        available = list(self.get_serializer_class()().fields)
+        unknown = sorted(set(fields + omit) - set(available))
+        if unknown:
+            message = f'Unknown fields: {", ".join(unknown)}'
+            raise ValidationError({self.fields_query_param: [message]})
+        self._sparse_fields = set(fields or available) - set(omit)
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        selected = self.get_sparse_fields()
+        if selected is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in list(fields):
+                if name not in selected:
+                    fields.pop(name)
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.get_sparse_fields()
+        if selected is None:
+            return queryset
+        return self.narrow_queryset(queryset, selected)
+
+    def get_sparse_columns(self, model, selected):
+        '''Model fields the selected serializer fields read, or None.'''
+        serializer = self.get_serializer_class()()
+        field_sources = getattr(serializer.Meta, 'field_sources', {})
+        ordering = getattr(self, 'cursor_ordering', ())
+        columns = {model._meta.pk.name, *(o.lstrip('-') for o in ordering)}
+        for name in selected:
+            field = serializer.fields[name]
+            if name in field_sources:
+                sources = field_sources[name]
+            elif isinstance(field, HyperlinkedIdentityField):
+                sources = [field.lookup_field]
+            else:
+                sources = [field.source]
+            for source in sources:
+                name = source.split('.')[0]
+                if name == 'pk':
+                    continue
+                try:
+                    columns.add(model._meta.get_field(name).name)
+                except FieldDoesNotExist:
+                    return None
+        return columns
+
+    def narrow_queryset(self, queryset, selected):
+        columns = self.get_sparse_columns(queryset.model, selected)
+        if columns is None:
+            return queryset
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            lookups = [
+                lookup for lookup in flatten(select_related)
+                if lookup.split('__')[0] in columns
+            ]
+            queryset = queryset.select_related(None)
+            if lookups:
+                queryset = queryset.select_related(*lookups)
+        prefetches = queryset._prefetch_related_lookups
+        queryset = queryset.prefetch_related(None).prefetch_related(*(
+            lookup for lookup in prefetches
+            if getattr(lookup, 'prefetch_to', lookup).split('__')[0] in columns
+        ))
+        concrete = [
+            field.name for field in queryset.model._meta.concrete_fields
+            if field.name in columns
+        ]
+        return queryset.only(*concrete)
@@ -0,0 +1,52 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import CharField, Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django_comments.models import Comment
+from core.models import Answer, Question
+
+
+def count(queryset, group):
+    totals = queryset.values(group).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(totals), Value(0))
+
+
+def latest(queryset, field):
+    values = queryset.order_by(f'-{field}').values(field)[:1]
+    return Coalesce(Subquery(values), F('timestamp'))
+
+
+class Command(BaseCommand):
+    help = 'Recomputes answer_count, comment_count and last_activity_at.'
+
+    def handle(self, *args, **options):
+        question_type = ContentType.objects.get_for_model(Question)
+        answer_type = ContentType.objects.get_for_model(Answer)
+        answers = Answer.objects.filter(question=OuterRef('pk')).order_by()
+        question_comments = Comment.objects.filter(
+            content_type=question_type,
+            object_pk=Cast(OuterRef('pk'), CharField()),
+        ).order_by()
+        answer_ids = (
+            Answer.objects
+            .filter(question=OuterRef(OuterRef('pk')))
+            .values(pk_text=Cast('pk', CharField()))
+        )
+        answer_comments = Comment.objects.filter(
+            content_type=answer_type, object_pk__in=answer_ids
+        )
+        with transaction.atomic():
+            updated = Question.objects.update(
+                answer_count=count(answers, 'question'),
+                comment_count=count(question_comments, 'object_pk'),
+                last_activity_at=Greatest(
+                    F('timestamp'),
+                    latest(answers, 'timestamp'),
+                    latest(question_comments, 'submit_date'),
+                    latest(answer_comments, 'submit_date'),
+                ),
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Backfilled counters for {updated} questions.'
+        ))
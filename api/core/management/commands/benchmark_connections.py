@@ -0,0 +1,90 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import reverse
+from core.models import Answer, Question
+from users.serializers import LoginSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures requests per second through the WSGI handler, which opens '
+        'and closes connections like a server does, for a new connection '
+        'per request, persistent connections and persistent connections '
+        'with health checks. With DATABASE_POOL_SIZE set, the first row is '
+        'a pool checkout per request; run once with and once without it to '
+        'compare pooling. Generated rows are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500)
+
+    def generate(self):
+        User = get_user_model()
+        user = User.objects.create_user(
+            username='benchmark-connections',
+            email='benchmark-connections@example.com', is_active=True,
+        )
+        question = Question.objects.create(
+            user=user, title='Benchmark connections question',
+            content='Some *markdown* content.',
+        )
+        Answer.objects.create(question=question, user=user, content='Answer.')
+        return user, question
+
+    def rate(self, handler, environ, count):
+        def start_response(status, headers):
+            if not status.startswith('2'):
+                raise CommandError(f'Request failed with {status}')
+
+        start = time.perf_counter()
+        for _ in range(count):
+            b''.join(handler(dict(environ), start_response))
+        return count / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        connection = connections[DEFAULT_DB_ALIAS]
+        settings_dict = connection.settings_dict
+        configured = {
+            key: settings_dict.get(key)
+            for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')
+        }
+        pooled = 'POOL_OPTIONS' in settings_dict
+        modes = [
+            ('pool checkout per request' if pooled else 'new connection per request',
+             {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}),
+        ]
+        if not pooled:
+            modes += [
+                ('persistent', {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': False}),
+                ('persistent with health checks',
+                 {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True}),
+            ]
+        user, question = self.generate()
+        token = LoginSerializer.get_token(user).access_token
+        # Authenticated requests skip the response cache and hit the database.
+        environ = RequestFactory().get(
+            reverse('core:question-detail', args=[question.pk]),
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        ).environ
+        handler = WSGIHandler()
+        self.stdout.write(f'Engine: {settings_dict["ENGINE"]}')
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                for name, overrides in modes:
+                    settings_dict.update(overrides)
+                    # close_at is computed when connecting, so start afresh.
+                    connection.close()
+                    self.rate(handler, environ, 10)
+                    rate = self.rate(handler, environ, count)
+                    self.stdout.write(f'{name}: {rate:.0f} req/s')
+        finally:
+            settings_dict.update(configured)
+            connection.close()
+            question.delete()
+            user.delete()
@@ -0,0 +1,109 @@
+import json
+import time
+from pathlib import Path
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from django_comments.models import Comment
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from core.models import Answer, Question
+from core.renderers import FastJSONRenderer
+from core.serializers import QuestionDetailSerializer, QuestionListSerializer
+from users.serializers import UserDetailSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Checks that FastJSONRenderer output is byte-identical to '
+        'JSONRenderer on the test fixtures and generated API payloads, and '
+        'times both. Generated rows are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--answers', type=int, default=200)
+        parser.add_argument('--comments', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def fixtures(self):
+        for path in sorted(Path(settings.BASE_DIR).glob('*/tests/data.json')):
+            with open(path) as file:
+                yield str(path.relative_to(settings.BASE_DIR)), json.load(file)
+
+    def generate(self, answers, comments):
+        User = get_user_model()
+        users = [
+            User.objects.create_user(
+                username=f'benchmark{number}',
+                email=f'benchmark{number}@example.com',
+                bio='Ünïcödé bio with a line\u2028separator.',
+            )
+            for number in range(10)
+        ]
+        question = Question.objects.create(
+            user=users[0], title='Benchmark question',
+            content='Some *markdown* content. ' * 20,
+        )
+        question.tags.add('benchmark', 'json', 'renderer')
+        for number in range(answers):
+            answer = Answer.objects.create(
+                question=question, user=users[number % len(users)],
+                content=f'Answer {number} with `code`. ' * 10,
+            )
+            Comment.objects.bulk_create([
+                Comment(
+                    content_object=answer, user=users[index % len(users)],
+                    comment=f'Comment {index} on answer {number}.',
+                    site_id=settings.SITE_ID, submit_date=timezone.now(),
+                )
+                for index in range(comments)
+            ])
+        return question, users
+
+    def payloads(self, answers, comments):
+        yield from self.fixtures()
+        question, users = self.generate(answers, comments)
+        request = APIRequestFactory().get('/')
+        request.user = users[0]
+        context = {'request': request}
+        detail = QuestionDetailSerializer(
+            Question.objects.prefetch_related(
+                'tags', 'answer_set__user', 'answer_set__comments__user'
+            ).get(pk=question.pk),
+            context=context,
+        )
+        yield 'question detail', detail.data
+        listing = QuestionListSerializer(
+            Question.objects.with_list_data(), many=True, context=context
+        )
+        yield 'question list', listing.data
+        yield 'user list', UserDetailSerializer(
+            get_user_model().objects.all(), many=True, context=context
+        ).data
+
+    def time(self, renderer, data, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            renderer.render(data)
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        # Hyperlinked fields build absolute URLs from the fake request's host.
+        with override_settings(ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            payloads = self.payloads(options['answers'], options['comments'])
+            for name, data in payloads:
+                expected = stdlib.render(data)
+                if fast.render(data) != expected:
+                    raise CommandError(f'{name}: output differs from JSONRenderer')
+                slow = self.time(stdlib, data, repeat)
+                quick = self.time(fast, data, repeat)
+                self.stdout.write(
+                    f'{name} ({len(expected)} bytes): identical, json '
+                    f'{slow:.2f} ms, orjson {quick:.2f} ms ({slow / quick:.1f}x)'
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,92 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from core.models import Answer, Question
+from users.serializers import LoginSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures API throughput with ATOMIC_REQUESTS on and with the '
+        'autocommit policy. Requests commit for real, so the generated rows '
+        'are deleted afterwards instead of rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--answers', type=int, default=20)
+
+    def generate(self, answers):
+        User = get_user_model()
+        author, voter = (
+            User.objects.create_user(
+                username=f'benchmark-{name}', email=f'benchmark-{name}@example.com',
+                is_active=True,
+            )
+            for name in ('author', 'voter')
+        )
+        question = Question.objects.create(
+            user=author, title='Benchmark transactions question',
+            content='Some *markdown* content.',
+        )
+        question.tags.add('benchmark')
+        for number in range(answers):
+            Answer.objects.create(
+                question=question, user=author, content=f'Answer {number}.'
+            )
+        return author, voter, question
+
+    def requests(self, question):
+        list_url = reverse('core:question-list')
+        detail_url = reverse('core:question-detail', args=[question.pk])
+        vote_url = reverse('core:question-vote', args=[question.pk])
+
+        def vote(client, number):
+            if number % 2:
+                return client.delete(vote_url)
+            return client.post(vote_url, {'value': True})
+
+        return [
+            ('GET question list', lambda client, number: client.get(list_url)),
+            ('GET question detail', lambda client, number: client.get(detail_url)),
+            ('POST/DELETE vote', vote),
+        ]
+
+    def rate(self, client, request, count):
+        start = time.perf_counter()
+        for number in range(count):
+            response = request(client, number)
+            if response.status_code >= 400:
+                raise CommandError(f'Request failed with {response.status_code}')
+        return count / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        settings_dict = connections[DEFAULT_DB_ALIAS].settings_dict
+        configured = settings_dict.get('ATOMIC_REQUESTS', False)
+        author, voter, question = self.generate(options['answers'])
+        token = LoginSerializer.get_token(voter).access_token
+        # Authenticated requests skip the response cache.
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']):
+                for name, request in self.requests(question):
+                    rates = {}
+                    for atomic in (True, False):
+                        settings_dict['ATOMIC_REQUESTS'] = atomic
+                        self.rate(client, request, 10)
+                        rates[atomic] = self.rate(client, request, count)
+                    self.stdout.write(
+                        f'{name}: ATOMIC_REQUESTS {rates[True]:.0f} req/s, '
+                        f'autocommit {rates[False]:.0f} req/s '
+                        f'({rates[False] / rates[True]:.2f}x)'
+                    )
+        finally:
+            settings_dict['ATOMIC_REQUESTS'] = configured
+            question.delete()
+            author.delete()
+            voter.delete()
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from core.models import Answer, Question
+from core.views import (
+    ActiveQuestionListView, MostVotedQuestionListView, NewestQuestionListView,
+    QuestionTaggedListView, TagListView, UnasweredQuestionListView
+)
+from users.views import UserListViewSet
+
+# Plan fragments that mean a full table read, per database vendor.
+SEQUENTIAL_SCANS = {
+    'sqlite': lambda line: ' SCAN ' in f' {line} ' and ' USING ' not in line,
+    'postgresql': lambda line: 'Seq Scan' in line,
+}
+
+
+def orders_by_primary_key(queryset):
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return list(ordering) in (['id'], ['pk']) and not queryset.query.where
+
+
+def get_endpoint_querysets():
+    """Querysets the API endpoints run, sliced like a page of results."""
+    question = Question(id=0)
+    return {
+        'questions/': NewestQuestionListView.queryset,
+        'questions/unaswered/': UnasweredQuestionListView.queryset,
+        'questions/most-voted/': MostVotedQuestionListView.queryset,
+        'questions/active/': ActiveQuestionListView.queryset,
+        'questions/tagged/<tag>/': QuestionTaggedListView(
+            kwargs={'tag': 'django'}
+        ).get_queryset(),
+        'questions/<pk>/ answers': Answer.objects.filter(question=question),
+        'questions/<pk>/votes/ delete': question.votes.filter(user_id=0),
+        'tags/': TagListView.queryset,
+        'users/': UserListViewSet.queryset,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN on each endpoint queryset and flags sequential scans.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Exit with an error if any sequential scan is found.',
+        )
+
+    def handle(self, *args, **options):
+        is_scan = SEQUENTIAL_SCANS.get(connection.vendor)
+        if is_scan is None:
+            raise CommandError(f'Unsupported database: {connection.vendor}.')
+        flagged = []
+        for name, queryset in get_endpoint_querysets().items():
+            plan = queryset[:10].explain()
+            scans = [line for line in plan.splitlines() if is_scan(line)]
+            if connection.vendor == 'sqlite' and orders_by_primary_key(queryset):
+                # A rowid table scan in key order stops at the LIMIT.
+                scans = []
+            if scans:
+                flagged.append(name)
+                self.stdout.write(self.style.WARNING(f'{name}: sequential scan'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{name}: ok'))
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+        if flagged and options['fail_on_scan']:
+            raise CommandError(
+                f'Sequential scans in: {", ".join(flagged)}.'
+            )
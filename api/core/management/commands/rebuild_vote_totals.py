@@ -0,0 +1,37 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from core.models import Answer, Question, Vote
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds question and answer vote totals from the Vote table.'
+
+    def rebuild(self, model):
+        content_type = ContentType.objects.get_for_model(model)
+        totals = (
+            Vote.objects
+            .filter(content_type=content_type, object_id=OuterRef('pk'))
+            .order_by()
+            .values('object_id')
+            .annotate(total=Sum(Case(
+                When(value=True, then=Value(1)),
+                default=Value(-1),
+                output_field=IntegerField(),
+            )))
+            .values('total')
+        )
+        return model.objects.update(
+            total_votes=Coalesce(Subquery(totals), Value(0))
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            questions = self.rebuild(Question)
+            answers = self.rebuild(Answer)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt vote totals for {questions} questions '
+            f'and {answers} answers.'
+        ))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django_comments.models import Comment
+from core.caching import bump
+from core.markdown import render_cached, render_markdown
+from core.models import Answer, Question
+from core.utils import revise_questions
+
+
+def batches(queryset, batch_size):
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk')[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-renders stored question and answer HTML and warms the comment '
+        'HTML cache. Run after changing the markdown settings.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def render(self, queryset, batch_size):
+        '''Saves rows whose HTML changed, returning their question ids.'''
+        question_ids = set()
+        fields = ['pk', 'content', 'content_html']
+        if queryset.model is Answer:
+            fields.append('question_id')
+        for batch in batches(queryset.only(*fields), batch_size):
+            changed = []
+            for instance in batch:
+                html = render_markdown(instance.content)
+                if html != instance.content_html:
+                    instance.content_html = html
+                    changed.append(instance)
+            queryset.model.objects.bulk_update(changed, ['content_html'])
+            question_ids.update(
+                getattr(instance, 'question_id', instance.pk)
+                for instance in changed
+            )
+        return question_ids
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        question_ids = self.render(Question.objects.all(), batch_size)
+        question_ids |= self.render(Answer.objects.all(), batch_size)
+        comments = 0
+        for batch in batches(Comment.objects.only('pk', 'comment'), batch_size):
+            for comment in batch:
+                render_cached(comment.comment)
+            comments += len(batch)
+        # bulk_update skips signals, so invalidate the affected pages here.
+        revise_questions(question_ids)
+        bump('questions', *(f'question:{pk}' for pk in question_ids))
+        self.stdout.write(self.style.SUCCESS(
+            f'Re-rendered {len(question_ids)} questions and warmed '
+            f'{comments} comments.'
+        ))
@@ -0,0 +1,79 @@
+import re
+from hashlib import sha1
+from html import unescape
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.cache import cache
+from markdown import Markdown
+from markdown.extensions import Extension
+from markdown.treeprocessors import Treeprocessor
+from markdownx.settings import (
+    MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS, MARKDOWNX_MARKDOWN_EXTENSIONS
+)
+
+RENDERED_KEY = 'core:markdown:{}'
+SAFE_SCHEMES = {'', 'http', 'https', 'mailto'}
+# Browsers drop tabs and newlines inside a URL (`java\tscript:`) and control
+# characters around it; removing them all only makes the check stricter.
+IGNORED_URL_CHARS = re.compile(r'[\x00-\x20\x7f]+')
+
+
+class SafeLinkTreeprocessor(Treeprocessor):
+    '''Drops links and images pointing at scripts or other unsafe schemes.'''
+
+    def run(self, root):
+        for element in root.iter():
+            for attribute in ('href', 'src'):
+                url = element.get(attribute)
+                if url is None:
+                    continue
+                # Entities are kept in the output and decoded by the browser,
+                # so check the scheme the browser will actually see.
+                url = IGNORED_URL_CHARS.sub('', unescape(url))
+                if urlparse(url).scheme.lower() not in SAFE_SCHEMES:
+                    del element.attrib[attribute]
+
+
+class SafeExtension(Extension):
+    '''Escapes raw HTML instead of passing it through.'''
+
+    def extendMarkdown(self, md):
+        md.preprocessors.deregister('html_block')
+        md.inlinePatterns.deregister('html')
+        md.treeprocessors.register(SafeLinkTreeprocessor(md), 'safe_links', 0)
+
+
+def get_fingerprint():
+    '''Changes whenever the rendering settings do.'''
+    return sha1(repr((
+        settings.MARKDOWN_RENDERER_VERSION,
+        MARKDOWNX_MARKDOWN_EXTENSIONS,
+        sorted(MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS.items()),
+    )).encode()).hexdigest()
+
+
+def render_markdown(text):
+    '''Renders user markdown to sanitized HTML.'''
+    md = Markdown(
+        extensions=[*MARKDOWNX_MARKDOWN_EXTENSIONS, SafeExtension()],
+        extension_configs=MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS,
+    )
+    return md.convert(text or '')
+
+
+def get_rendered_key(text):
+    digest = sha1(f'{get_fingerprint()}\n{text}'.encode()).hexdigest()
+    return RENDERED_KEY.format(digest)
+
+
+def render_cached(text):
+    '''Renders markdown through a cache keyed by content and renderer.
+
+    Used for models we can't add a column to, like comments.
+    '''
+    key = get_rendered_key(text)
+    html = cache.get(key)
+    if html is None:
+        html = render_markdown(text)
+        cache.set(key, html, timeout=None)
+    return html
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['timestamp', 'id'], name='core_questi_timesta_b16714_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['total_votes', 'id'], name='core_questi_total_v_867385_idx'),
+        ),
+    ]
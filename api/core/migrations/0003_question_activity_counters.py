@@ -0,0 +1,80 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:16
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+import django.utils.timezone
+
+
+def fill_activity_counters(apps, schema_editor):
+    Question = apps.get_model('core', 'Question')
+    Answer = apps.get_model('core', 'Answer')
+    Comment = apps.get_model('django_comments', 'Comment')
+    answers = {
+        row['question']: row for row in Answer.objects.order_by()
+        .values('question').annotate(count=Count('id'), last=Max('timestamp'))
+    }
+    question_comments = {
+        int(row['object_pk']): row for row in Comment.objects.filter(
+            content_type__app_label='core', content_type__model='question'
+        ).order_by().values('object_pk').annotate(
+            count=Count('id'), last=Max('submit_date')
+        )
+    }
+    answer_questions = dict(Answer.objects.values_list('id', 'question_id'))
+    answer_comments = {}
+    for object_pk, last in Comment.objects.filter(
+        content_type__app_label='core', content_type__model='answer'
+    ).order_by().values('object_pk').annotate(
+        last=Max('submit_date')
+    ).values_list('object_pk', 'last'):
+        question_id = answer_questions.get(int(object_pk))
+        if question_id is not None:
+            answer_comments[question_id] = max(
+                last, answer_comments.get(question_id, last)
+            )
+    questions = []
+    for question in Question.objects.only('timestamp').iterator():
+        answer_row = answers.get(question.id, {})
+        comment_row = question_comments.get(question.id, {})
+        question.answer_count = answer_row.get('count', 0)
+        question.comment_count = comment_row.get('count', 0)
+        question.last_activity_at = max(filter(None, [
+            question.timestamp, answer_row.get('last'),
+            comment_row.get('last'), answer_comments.get(question.id),
+        ]))
+        questions.append(question)
+    Question.objects.bulk_update(
+        questions, ['answer_count', 'comment_count', 'last_activity_at'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_question_feed_indexes'),
+        ('django_comments', '0004_add_object_pk_is_removed_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='answer_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['last_activity_at', 'id'], name='core_questi_last_ac_6d059f_idx'),
+        ),
+        migrations.RunPython(fill_activity_counters, migrations.RunPython.noop),
+    ]
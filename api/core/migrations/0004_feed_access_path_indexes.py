@@ -0,0 +1,21 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_question_activity_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'accepted', 'timestamp'], name='core_answer_questio_94ae69_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(condition=models.Q(('has_answer', False)), fields=['timestamp', 'id'], name='question_unanswered_idx'),
+        ),
+    ]
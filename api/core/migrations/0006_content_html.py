@@ -0,0 +1,23 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_question_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_content_html'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'total_votes', 'id'], name='core_answer_questio_d6a894_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'timestamp', 'id'], name='core_answer_questio_c650f0_idx'),
+        ),
+    ]
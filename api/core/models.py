@@ -1,14 +1,26 @@
-from collections import Counter
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
-from django.db.models import Count
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from django_comments.models import Comment
 from slugify import slugify
 from taggit.managers import TaggableManager
+from taggit.models import TaggedItem
 from markdownx.models import MarkdownxField
+from core.markdown import render_markdown
+
+
+def render_content(instance, save_kwargs):
+    '''Renders `content_html` unless the save leaves `content` alone.'''
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None:
+        if 'content' not in update_fields:
+            return
+        save_kwargs['update_fields'] = {*update_fields, 'content_html'}
+    instance.content_html = render_markdown(instance.content)
 
 
 class Vote(models.Model):
@@ -39,8 +51,18 @@ class Vote(models.Model):
 
 class QuestionQuerySet(models.query.QuerySet):
 
+    def with_list_data(self):
+        return self.select_related('user').prefetch_related('tags')
+
+    def with_detail_data(self):
+        # Answers and comments are paged and fetched by the detail view.
+        return self.with_list_data()
+
     def get_most_voted(self):
-        return self.order_by('total_votes')
+        return self.order_by('total_votes', 'id')
+
+    def get_active(self):
+        return self.order_by('-last_activity_at', '-id')
 
     def get_unanswered(self):
         return self.filter(has_answer=False)
@@ -48,17 +70,19 @@ class QuestionQuerySet(models.query.QuerySet):
     def get_tagged(self, tag):
         return self.filter(tags__name=tag)
 
-    def get_counted_tags(self):
-        tag_dict = {}
-        query = self.all().annotate(tagged=Count('tags')).filter(tags__gt=0)
-        for question in query:
-            for tag in question.tags.names():
-                if tag not in tag_dict:
-                    tag_dict[tag] = 1
-                else: # pragma: no cover
-                    tag_dict[tag] += 1
-        return sorted(tag_dict.items(), key=lambda item: item[1])
-
+    def get_counted_tags(self, limit=None):
+        content_type = ContentType.objects.get_for_model(self.model)
+        counted_tags = (
+            TaggedItem.objects
+            .filter(content_type=content_type, object_id__in=self.values('id'))
+            .values('tag__name')
+            .annotate(count=Count('id'))
+            .order_by('-count', 'tag__name')
+            .values_list('tag__name', 'count')
+        )
+        if limit is not None:
+            counted_tags = counted_tags[:limit]
+        return list(counted_tags)
 
 
 class Question(models.Model):
@@ -72,8 +96,15 @@ class Question(models.Model):
     slug = models.SlugField(max_length=80, null=True, blank=True)
     status = models.CharField(max_length=1, choices=STATUS, default=DRAFT)
     content = MarkdownxField()
+    content_html = models.TextField(blank=True, editable=False)
     has_answer = models.BooleanField(default=False)
     total_votes = models.IntegerField(default=0)
+    answer_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    # Bumped whenever the question or anything nested in its detail changes.
+    revision = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
     votes = GenericRelation(Vote)
     comments = GenericRelation(Comment, object_id_field='object_pk')
     tags = TaggableManager()
@@ -83,12 +114,23 @@ class Question(models.Model):
         ordering = ['-timestamp']
         verbose_name = _('Question')
         verbose_name_plural = _('Questions')
+        indexes = [
+            models.Index(fields=['timestamp', 'id']),
+            models.Index(
+                fields=['timestamp', 'id'],
+                condition=models.Q(has_answer=False),
+                name='question_unanswered_idx',
+            ),
+            models.Index(fields=['total_votes', 'id']),
+            models.Index(fields=['last_activity_at', 'id']),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(
                 self.title, lowercase=True, max_length=80
             )
+        render_content(self, kwargs)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -96,18 +138,26 @@ class Question(models.Model):
 
     @property
     def count_answers(self):
-        return Answer.objects.filter(question=self).count()
+        return self.answer_count
 
-    def count_votes(self):
-        dic = Counter(self.votes.values_list('value', flat=True))
-        Question.objects.filter(id=self.id).update(total_votes=dic[True] - dic[False])
-        self.refresh_from_db()
+    def update_total_votes(self, delta):
+        Question.objects.filter(id=self.id).update(
+            total_votes=F('total_votes') + delta
+        )
+        self.refresh_from_db(fields=['total_votes'])
 
 
 class Answer(models.Model):
+    # Keyset orderings for the answers of a question, each backed by an index.
+    SORTS = {
+        'votes': ('-total_votes', '-id'),
+        'newest': ('-timestamp', '-id'),
+        'oldest': ('timestamp', 'id'),
+    }
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     content = MarkdownxField()
+    content_html = models.TextField(blank=True, editable=False)
     total_votes = models.IntegerField(default=0)
     timestamp = models.DateTimeField(auto_now_add=True)
     accepted = models.BooleanField(default=False)
@@ -118,27 +168,38 @@ class Answer(models.Model):
         ordering = ['-accepted', '-timestamp']
         verbose_name = _('Answer')
         verbose_name_plural = _('Answers')
+        indexes = [
+            models.Index(fields=['question', 'accepted', 'timestamp']),
+            models.Index(fields=['question', 'total_votes', 'id']),
+            models.Index(fields=['question', 'timestamp', 'id']),
+        ]
+
+    def save(self, *args, **kwargs):
+        render_content(self, kwargs)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.content
 
-    def count_votes(self):
-        dic = Counter(self.votes.values_list('value', flat=True))
+    def update_total_votes(self, delta):
         Answer.objects.filter(id=self.id).update(
-            total_votes=dic[True] - dic[False]
+            total_votes=F('total_votes') + delta
         )
-        self.refresh_from_db()
+        self.refresh_from_db(fields=['total_votes'])
 
     def accept_answer(self):
-        answer_set = Answer.objects.filter(question=self.question)
-        answer_set.update(accepted=False)
-        self.accepted = True
-        self.save()
-        self.question.has_answer = True
-        self.question.save()
+        with transaction.atomic():
+            answer_set = Answer.objects.filter(question=self.question)
+            answer_set.update(accepted=False)
+            self.accepted = True
+            self.save(update_fields=['accepted'])
+            self.question.has_answer = True
+            self.question.save(update_fields=['has_answer'])
 
     def undo_accept_answer(self):
-        answer_set = Answer.objects.filter(question=self.question)
-        answer_set.update(accepted=False)
-        self.question.has_answer = False
-        self.question.save()
\ No newline at end of file
+        with transaction.atomic():
+            answer_set = Answer.objects.filter(question=self.question)
+            answer_set.update(accepted=False)
+            self.accepted = False
+            self.question.has_answer = False
+            self.question.save(update_fields=['has_answer'])
\ No newline at end of file
@@ -0,0 +1,163 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from itertools import islice
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q, prefetch_related_objects
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def flip(ordering):
+    return ordering[1:] if ordering.startswith('-') else f'-{ordering}'
+
+
+class KeysetPagination(BasePagination):
+    '''Cursor pagination over the view's `cursor_ordering`.
+
+    The cursor holds the full sort key of the boundary row, so every page
+    is a single indexed range scan. The ordering must end with a unique
+    field (usually `id`) to break ties.
+    '''
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.set_ordering(queryset.model, view.cursor_ordering)
+        return self.get_page(queryset, self.decode_cursor(request))
+
+    def set_ordering(self, model, ordering):
+        self.ordering = list(ordering)
+        self.fields = [
+            model._meta.get_field(ordering.lstrip('-'))
+            for ordering in self.ordering
+        ]
+
+    def get_page(self, queryset, cursor):
+        '''Reads the page at `cursor`, or the first page if it is None.'''
+        reverse = False
+        if cursor is not None:
+            values, reverse = cursor
+            queryset = queryset.filter(self.get_position_filter(values, reverse))
+        ordering = [flip(o) for o in self.ordering] if reverse else self.ordering
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = results
+        return results
+
+    def get_position_filter(self, values, reverse):
+        '''Rows strictly after `values` in (reversed) sort order.'''
+        position = Q()
+        for index, ordering in enumerate(self.ordering):
+            descending = ordering.startswith('-') != reverse
+            lookup = 'lt' if descending else 'gt'
+            condition = Q(**{f'{self.fields[index].name}__{lookup}': values[index]})
+            for field, value in zip(self.fields[:index], values):
+                condition &= Q(**{field.name: value})
+            position |= condition
+        return position
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            if len(data['p']) != len(self.fields):
+                raise ValueError
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, data['p'])
+            ]
+            return values, bool(data['r'])
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse):
+        data = {
+            'p': [field.value_to_string(instance) for field in self.fields],
+            'r': int(reverse),
+        }
+        encoded = urlsafe_b64encode(json.dumps(data).encode('ascii'))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode('ascii')
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class CursorPaginationMixin:
+    '''Lets clients opt into keyset pagination with `?pagination=cursor`.'''
+    cursor_ordering = ('-timestamp', '-id')
+    page_pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+
+    @property
+    def pagination_class(self):
+        request = getattr(self, 'request', None)
+        if request is not None:
+            params = request.query_params
+            if (params.get('pagination') == 'cursor' or
+                    KeysetPagination.cursor_query_param in params):
+                return KeysetPagination
+        return self.page_pagination_class
+
+
+class StreamingListMixin:
+    '''Streams every row as one JSON array with `?stream=true`.
+
+    Meant for export-style consumers. Rows are read with `.iterator()` and
+    the queryset's prefetches are applied per chunk, so memory stays flat.
+    '''
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream') != 'true':
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream(queryset), content_type='application/json'
+        )
+
+    def stream(self, queryset):
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        prefetch = queryset._prefetch_related_lookups
+        rows = queryset.prefetch_related(None).iterator(self.stream_chunk_size)
+        yield b'['
+        separator = b''
+        while True:
+            chunk = list(islice(rows, self.stream_chunk_size))
+            if not chunk:
+                break
+            prefetch_related_objects(chunk, *prefetch)
+            for item in self.get_serializer(chunk, many=True).data:
+                yield separator + renderer.render(item)
+                separator = b','
+        yield b']'
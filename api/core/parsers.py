@@ -0,0 +1,24 @@
+import io
+from rest_framework.parsers import JSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    '''`JSONParser` on top of orjson.
+
+    Bodies orjson can't read (other encodings, integers over 64 bits) and
+    malformed ones go through the stdlib parser, so results and error
+    messages match JSONParser.
+    '''
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('_', '-') != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,136 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = 'core:primary-pin:{}'
+
+# The replica the current request reads from, or None for the primary.
+replica_alias = ContextVar('replica_alias', default=None)
+
+
+def pin_to_primary(user):
+    '''Sends the user's reads to the primary for `REPLICA_PIN_SECONDS`.'''
+    cache.set(PIN_KEY.format(user.pk), True, settings.REPLICA_PIN_SECONDS)
+
+
+def choose_replica(user):
+    '''A replica for the user to read from, or None for the primary.'''
+    if not settings.DATABASE_REPLICAS:
+        return None
+    if user.is_authenticated and cache.get(PIN_KEY.format(user.pk)):
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+class ReplicaRouter:
+    '''Reads from the request's replica, if any, and writes to the primary.'''
+
+    def db_for_read(self, model, **hints):
+        return replica_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+
+@contextmanager
+def primary_reads():
+    '''Routes the reads inside the block to the primary.'''
+    token = replica_alias.set(None)
+    try:
+        yield
+    finally:
+        replica_alias.reset(token)
+
+
+def bind_replica(content, alias):
+    '''Iterates `content` with reads routed to `alias`.
+
+    Streaming responses are consumed after the view returns; set the alias
+    around each step rather than across yields, which may not share a
+    context with the view.
+    '''
+    content = iter(content)
+    while True:
+        token = replica_alias.set(alias)
+        try:
+            chunk = next(content)
+        except StopIteration:
+            return
+        finally:
+            replica_alias.reset(token)
+        yield chunk
+
+
+class ReplicaReadMixin:
+    '''Serves the view's read-only actions from a replica.
+
+    Authentication still reads the primary, and users who wrote recently
+    are pinned there so they see their own writes. Views without actions
+    use the replica for GET and HEAD.
+    '''
+    replica_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        action = getattr(self, 'action', None)
+        if action is None:
+            read_only = request.method in ('GET', 'HEAD')
+        else:
+            read_only = action in self.replica_actions
+        if read_only:
+            self.replica_token = replica_alias.set(choose_replica(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, 'replica_token', None)
+        if token is not None:
+            alias = replica_alias.get()
+            replica_alias.reset(token)
+            self.replica_token = None
+            if response.streaming:
+                response.streaming_content = bind_replica(
+                    response.streaming_content, alias
+                )
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def replica_reads(view_func):
+    '''Function view version of `ReplicaReadMixin`.'''
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        token = replica_alias.set(choose_replica(request.user))
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            replica_alias.reset(token)
+    return wrapper
+
+
+class PrimaryPinMiddleware:
+    '''Pins users to the primary after a successful write.
+
+    Runs after the view, so it sees the user DRF authenticated. The pin
+    lives in the cache, which must be shared between processes.
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS
+                and response.status_code < 400):
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user)
+        return response
@@ -1,28 +1,75 @@
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from rest_framework import serializers
+from django.db import IntegrityError
+from rest_framework import exceptions, serializers, status
+from rest_framework.settings import api_settings
 from django_comments.models import Comment
 from taggit.models import Tag
 from taggit.serializers import TagListSerializerField, TaggitSerializer
+from core.markdown import render_cached
 from core.models import Answer, Question
 from users.serializers import UserListSerializer
-from core.utils import is_owner, update_votes
+from core.utils import (
+    bulk_update_votes, get_answer_page, get_vote_targets, is_owner,
+    update_votes
+)
 
 __all__ = [
     'CommentListSerializer', 'CommentCreateSerializer',  'CommentEditSerializer',
     'AnswerListSerializer', 'AnswerListSerializer', 'AnswerCreateSerializer',
     'QuestionListSerializer',
     'QuestionCreateSerializer', 'QuestionDetailSerializer', 'TagListSerializer',
-    'CountedTagsSerializer', 'QuestionVoteSerializer', 'AnswerVoteSerializer'
+    'CountedTagsSerializer', 'QuestionVoteSerializer', 'AnswerVoteSerializer',
+    'BulkVoteSerializer',
 ]
 
 
+class VoteStateMixin:
+    '''Reads the request user's vote from the `user_votes` context map.'''
+
+    def get_vote(self, instance):
+        user = self.context['request'].user
+        if not user.is_authenticated:
+            return None
+        user_votes = self.context.get('user_votes')
+        if user_votes is None:
+            votes = instance.votes.filter(user=user)
+            return votes.values_list('value', flat=True).first()
+        content_type = ContentType.objects.get_for_model(instance)
+        return user_votes.get((content_type.id, instance.id))
+
+    def get_upvoted(self, instance):
+        return self.get_vote(instance) is True
+
+    def get_downvoted(self, instance):
+        return self.get_vote(instance) is False
+
+
 class CommentListSerializer(serializers.ModelSerializer):
+    comment_html = serializers.SerializerMethodField()
     user = UserListSerializer(read_only=True)
 
     class Meta:
         model = Comment
-        fields = ['id', 'comment', 'submit_date', 'user']
+        fields = ['id', 'comment', 'comment_html', 'submit_date', 'user']
+
+    def get_comment_html(self, instance):
+        return render_cached(instance.comment)
+
+
+class ThreadCommentsMixin:
+    '''Reads comments from the `thread_comments` context map.'''
+
+    def get_comment_set(self, instance):
+        thread = self.context.get('thread_comments')
+        if thread is None:
+            comments = instance.comments.select_related('user')
+        else:
+            content_type = ContentType.objects.get_for_model(instance)
+            comments = thread.get((content_type.id, str(instance.pk)), [])
+        return CommentListSerializer(
+            comments, many=True, context=self.context
+        ).data
 
 
 class CommentCreateSerializer(serializers.ModelSerializer):
@@ -48,28 +95,19 @@ class CommentEditSerializer(serializers.ModelSerializer):
         fields = ['comment']
 
 
-class AnswerListSerializer(serializers.ModelSerializer):
-    comment_set = CommentListSerializer(many=True, read_only=True, source='comments')
+class AnswerListSerializer(ThreadCommentsMixin, VoteStateMixin,
+                           serializers.ModelSerializer):
+    comment_set = serializers.SerializerMethodField()
     upvoted = serializers.SerializerMethodField()
     downvoted = serializers.SerializerMethodField()
 
     class Meta:
         model = Answer
         fields = [
-            'id', 'content', 'user', 'timestamp', 'total_votes',
-            'accepted', 'upvoted', 'downvoted', 'comment_set'
+            'id', 'content', 'content_html', 'user', 'timestamp',
+            'total_votes', 'accepted', 'upvoted', 'downvoted', 'comment_set'
         ]
 
-    def get_upvoted(self, instance):
-        user = self.context['request'].user
-        user_voted = instance.votes.filter(value=True, user=user).exists()
-        return True if user_voted else False
-
-    def get_downvoted(self, instance):
-        user = self.context['request'].user
-        user_voted = instance.votes.filter(value=False, user=user).exists()
-        return True if user_voted else False
-
 
 class AnswerCreateSerializer(serializers.ModelSerializer):
     question = serializers.PrimaryKeyRelatedField(queryset=Question.objects.all())
@@ -92,9 +130,11 @@ class QuestionListSerializer(TaggitSerializer, serializers.ModelSerializer):
     class Meta:
         model = Question
         fields = [
-            'url', 'title', 'content', 'total_votes', 'count_answers',
-            'has_answer', 'tags', 'timestamp', 'user',
+            'url', 'title', 'content', 'content_html', 'total_votes',
+            'count_answers', 'comment_count', 'has_answer', 'tags', 'timestamp',
+            'last_activity_at', 'user',
         ]
+        field_sources = {'count_answers': ['answer_count']}
 
 
 class QuestionCreateSerializer(TaggitSerializer, serializers.ModelSerializer):
@@ -110,10 +150,13 @@ class QuestionCreateSerializer(TaggitSerializer, serializers.ModelSerializer):
         return question
 
 
-class QuestionDetailSerializer(serializers.ModelSerializer):
+class QuestionDetailSerializer(ThreadCommentsMixin, VoteStateMixin,
+                               serializers.ModelSerializer):
     url = serializers.HyperlinkedIdentityField(view_name='core:question-detail')
-    answer_set = AnswerListSerializer(many=True, read_only=True)
-    comment_set = CommentListSerializer(many=True, read_only=True, source='comments')
+    accepted_answer = serializers.SerializerMethodField()
+    answer_set = serializers.SerializerMethodField()
+    answers_next = serializers.SerializerMethodField()
+    comment_set = serializers.SerializerMethodField()
     tags = TagListSerializerField()
     user = UserListSerializer(read_only=True)
     upvoted = serializers.SerializerMethodField()
@@ -122,20 +165,52 @@ class QuestionDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Question
         fields = [
-            'url', 'id', 'title', 'slug', 'content', 'total_votes',
-            'upvoted', 'downvoted', 'count_answers', 'has_answer',
-            'timestamp', 'user', 'tags', 'comment_set', 'answer_set'
+            'url', 'id', 'title', 'slug', 'content', 'content_html',
+            'total_votes', 'upvoted', 'downvoted', 'count_answers', 'has_answer',
+            'timestamp', 'user', 'tags', 'comment_set', 'accepted_answer',
+            'answer_set', 'answers_next',
         ]
-
-    def get_upvoted(self, instance):
-        user = self.context['request'].user
-        user_voted = instance.votes.filter(value=True, user=user).exists()
-        return True if user_voted else False
-
-    def get_downvoted(self, instance):
-        user = self.context['request'].user
-        user_voted = instance.votes.filter(value=False, user=user).exists()
-        return True if user_voted else False
+        field_sources = {
+            'upvoted': [], 'downvoted': [], 'count_answers': ['answer_count'],
+            'accepted_answer': [], 'answer_set': [], 'answers_next': [],
+            'comment_set': [],
+        }
+
+    def get_answers(self, instance):
+        '''The view's `answers` context, or the same page built here.'''
+        if 'answers' in self.context:
+            return self.context['answers']
+        pages = self.__dict__.setdefault('answer_pages', {})
+        if instance.pk not in pages:
+            pages[instance.pk] = get_answer_page(
+                instance.pk, self.context['request']
+            )
+        return pages[instance.pk]
+
+    def update(self, instance, validated_data):
+        # Write back only the edited columns; the counters are maintained
+        # with F() updates and the row loaded for this request may be stale.
+        tags = validated_data.pop('tags', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        if tags is not None:
+            instance.tags.set(*tags)
+        return instance
+
+    def get_accepted_answer(self, instance):
+        accepted = self.get_answers(instance)['accepted']
+        if accepted is None:
+            return None
+        return AnswerListSerializer(accepted, context=self.context).data
+
+    def get_answer_set(self, instance):
+        return AnswerListSerializer(
+            self.get_answers(instance)['page'], many=True, context=self.context
+        ).data
+
+    def get_answers_next(self, instance):
+        return self.get_answers(instance)['next']
 
 
 class TagListSerializer(serializers.ModelSerializer):
@@ -199,4 +274,71 @@ class AnswerVoteSerializer(serializers.Serializer):
         user = validated_data['user']
         value = validated_data['value']
         update_votes(answer, user, value)
-        return answer.votes
\ No newline at end of file
+        return answer.votes
+
+
+class VoteConflict(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Votes changed concurrently, try again.'
+    default_code = 'conflict'
+
+
+class BulkVoteListSerializer(serializers.ListSerializer):
+
+    def to_internal_value(self, data):
+        # Refuse oversized payloads before validating any item.
+        if isinstance(data, list) and len(data) > settings.BULK_VOTES_LIMIT:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'At most {settings.BULK_VOTES_LIMIT} votes per request.'
+                ]
+            })
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        user = self.context['user']
+        object_ids = {'question': [], 'answer': []}
+        for item in attrs:
+            object_ids[item['object_type']].append(item['object_id'])
+        targets = get_vote_targets(object_ids['question'], object_ids['answer'])
+        errors = []
+        for index, item in enumerate(attrs):
+            key = (item['object_type'], item['object_id'])
+            if key not in targets:
+                errors.append(f'Item {index}: {key[0]} {key[1]} does not exist.')
+            elif targets[key][0] == user.id:
+                errors.append(f"Item {index}: You can't vote your own {key[0]}.")
+        if errors:
+            raise serializers.ValidationError(errors)
+        self.question_ids = {
+            targets[(item['object_type'], item['object_id'])][1]
+            for item in attrs
+        }
+        return attrs
+
+    def create(self, validated_data):
+        models = {'question': Question, 'answer': Answer}
+        # Later items win, like replaying the single vote endpoints in order.
+        votes = {
+            (models[item['object_type']], item['object_id']): item['value']
+            for item in validated_data
+        }
+        # Another request may insert one of these votes between our locked
+        # read and the insert; once it commits, a replay sees it as existing.
+        for _ in range(2):
+            try:
+                return bulk_update_votes(
+                    self.context['user'], votes, self.question_ids
+                )
+            except IntegrityError:
+                pass
+        raise VoteConflict()
+
+
+class BulkVoteSerializer(serializers.Serializer):
+    object_type = serializers.ChoiceField(choices=['question', 'answer'])
+    object_id = serializers.IntegerField(min_value=1)
+    value = serializers.BooleanField()
+
+    class Meta:
+        list_serializer_class = BulkVoteListSerializer
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_comments.models import Comment
+from taggit.models import Tag, TaggedItem
+from core.caching import bump
+from core.markdown import render_cached
+from core.models import Answer, Question, Vote
+from core.utils import (
+    clear_popular_tags, get_question_ids, question_content_changed,
+    update_comment_activity, update_question_activity
+)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+@receiver(post_delete, sender=Question)
+def tags_changed(sender, **kwargs):
+    transaction.on_commit(clear_popular_tags)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed(sender, instance, created=False, **kwargs):
+    transaction.on_commit(lambda: bump('tags'))
+    if not created:
+        transaction.on_commit(lambda: bump('questions', 'tag-names'))
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def tagged_item_changed(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump('tags'))
+    question_content_changed(
+        get_question_ids(instance.content_type, instance.object_id)
+    )
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    question_content_changed([instance.pk])
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def answer_changed(sender, instance, **kwargs):
+    question_content_changed([instance.question_id])
+
+
+@receiver(post_save, sender=Vote)
+@receiver(post_delete, sender=Vote)
+def vote_changed(sender, instance, **kwargs):
+    question_content_changed(
+        get_question_ids(instance.content_type, instance.object_id)
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    question_content_changed(
+        get_question_ids(instance.content_type, instance.object_pk)
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login and, when rehashing, the password;
+    # neither is ever serialized.
+    if update_fields and set(update_fields) <= {'last_login', 'password'}:
+        return
+    transaction.on_commit(lambda: bump('users'))
+
+
+@receiver(post_save, sender=Answer)
+def answer_saved(sender, instance, created, **kwargs):
+    if not created:
+        return
+    questions = Question.objects.filter(id=instance.question_id)
+    update_question_activity(questions, answers=1)
+    if Answer.question.is_cached(instance):
+        instance.question.refresh_from_db(
+            fields=['answer_count', 'last_activity_at']
+        )
+
+
+@receiver(post_delete, sender=Answer)
+def answer_deleted(sender, instance, **kwargs):
+    questions = Question.objects.filter(id=instance.question_id)
+    update_question_activity(questions, answers=-1, touch=False)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    render_cached(instance.comment)
+    if created:
+        update_comment_activity(instance, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    update_comment_activity(instance, -1)
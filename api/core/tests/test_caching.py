@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django_comments.models import Comment
+from rest_framework import status
+from core.models import Answer
+from core.tests.test_views import ViewsTestCase
+from core.utils import update_votes
+
+
+class ResponseCacheTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.list_url = reverse('core:question-list')
+        self.detail_url = reverse('core:question-detail', args=[self.question.id])
+
+    def test_cache_hit(self):
+        self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_detail_cache_hit(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        # Just the revision lookup.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.data['title'], self.question.title)
+
+    def test_query_params(self):
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url, {'page': 2})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_scheme_and_host(self):
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url, secure=True)
+        self.assertTrue(response.data['results'][0]['url'].startswith('https:'))
+        with self.settings(ALLOWED_HOSTS=['testserver', 'internal']):
+            response = self.client.get(self.list_url, HTTP_HOST='internal')
+        self.assertTrue(
+            response.data['results'][0]['url'].startswith('http://internal/')
+        )
+
+    def test_authenticated_bypass(self):
+        self.client.force_authenticate(user=self.other_user)
+        self.client.get(self.detail_url)
+        update_votes(self.question, self.other_user, True)
+        response = self.client.get(self.detail_url)
+        self.assertTrue(response.data['upvoted'])
+
+    def test_answer_invalidates(self):
+        self.client.get(self.detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Answer.objects.create(
+                question=self.question, user=self.other_user,
+                content='New answer.',
+            )
+        response = self.client.get(self.detail_url)
+        self.assertEqual(len(response.data['answer_set']), 3)
+
+    def test_vote_invalidates(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            update_votes(self.answer, self.other_user, True)
+        response = self.client.get(self.detail_url)
+        answers = {answer['id']: answer for answer in response.data['answer_set']}
+        self.assertEqual(answers[self.answer.id]['total_votes'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            update_votes(self.question, self.other_user, False)
+        response = self.client.get(self.list_url)
+        totals = {item['title']: item['total_votes'] for item in response.data['results']}
+        self.assertEqual(totals[self.question.title], -1)
+
+    def test_comment_invalidates(self):
+        self.client.get(self.detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                content_object=self.answer, user=self.user,
+                comment='A comment.', site_id=1,
+            )
+        response = self.client.get(self.detail_url)
+        answers = {answer['id']: answer for answer in response.data['answer_set']}
+        self.assertEqual(len(answers[self.answer.id]['comment_set']), 1)
+
+    def test_other_question_kept(self):
+        other_url = reverse('core:question-detail', args=[self.other_question.id])
+        etag = self.client.get(other_url)['ETag']
+        Answer.objects.create(
+            question=self.question, user=self.other_user, content='New answer.'
+        )
+        response = self.client.get(other_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalidated_on_commit(self):
+        etag = self.client.get(self.list_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Answer.objects.create(
+                question=self.question, user=self.other_user,
+                content='New answer.',
+            )
+            # Until the answer commits, readers keep the cached page.
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(
+                response.status_code, status.HTTP_304_NOT_MODIFIED
+            )
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_invalidates(self):
+        self.client.get(self.list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.location = 'Somewhere'
+            self.user.save()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['results'][0]['user']['location'], 'Somewhere')
+
+    def test_conditional_get(self):
+        response = self.client.get(self.detail_url)
+        etag = response['ETag']
+        # Just the revision lookup.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.title = 'Edited title'
+            self.question.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Edited title')
+
+    def test_tags_invalidate(self):
+        url = reverse('core:tag-list')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_question.tags.add('test3')
+        response = self.client.get(url)
+        self.assertEqual(response.data['count'], 3)
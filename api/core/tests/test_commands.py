@@ -0,0 +1,101 @@
+import json
+import os
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django_comments.models import Comment
+from core.markdown import render_markdown
+from core.models import Question, Answer
+from core.utils import update_votes
+
+
+class CommandsTestCase(TestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        base_dir = os.path.dirname(__file__)
+        file_path = os.path.join(base_dir, 'data.json')
+        with open(file_path) as file:
+            data = json.load(file)
+        self.user = User.objects.create_user(**data.get('user_data'))
+        self.other_user = User.objects.create_user(**data.get('other_user_data'))
+        question_data = data.get('question_data')
+        question_data['user'] = self.user
+        self.question = Question.objects.create(**question_data)
+        answer_data = data.get('answer_data')
+        answer_data['question'] = self.question
+        answer_data['user'] = self.user
+        self.answer = Answer.objects.create(**answer_data)
+
+
+class RebuildVoteTotalsTestCase(CommandsTestCase):
+
+    def test_rebuild_vote_totals(self):
+        update_votes(self.question, self.other_user, True)
+        update_votes(self.answer, self.other_user, False)
+        Question.objects.update(total_votes=10)
+        Answer.objects.update(total_votes=10)
+        out = StringIO()
+        call_command('rebuild_vote_totals', stdout=out)
+        self.question.refresh_from_db()
+        self.answer.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 1)
+        self.assertEqual(self.answer.total_votes, -1)
+        self.assertIn('1 questions and 1 answers', out.getvalue())
+
+
+class BackfillQuestionCountersTestCase(CommandsTestCase):
+
+    def test_backfill_question_counters(self):
+        comment = Comment.objects.create(
+            content_object=self.answer, user=self.user,
+            comment='A comment.', site_id=1,
+        )
+        Comment.objects.create(
+            content_object=self.question, user=self.user,
+            comment='Another comment.', site_id=1,
+        )
+        Question.objects.update(
+            answer_count=5, comment_count=5,
+            last_activity_at=self.question.timestamp,
+        )
+        out = StringIO()
+        call_command('backfill_question_counters', stdout=out)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answer_count, 1)
+        self.assertEqual(self.question.comment_count, 1)
+        self.assertGreaterEqual(self.question.last_activity_at, comment.submit_date)
+        self.assertIn('1 questions', out.getvalue())
+
+
+class RenderMarkdownTestCase(CommandsTestCase):
+
+    def test_render_markdown(self):
+        Comment.objects.create(
+            content_object=self.answer, user=self.user,
+            comment='*A comment.*', site_id=1,
+        )
+        Question.objects.update(content_html='')
+        revision = Question.objects.get().revision
+        out = StringIO()
+        call_command('render_markdown', stdout=out)
+        self.question.refresh_from_db()
+        self.answer.refresh_from_db()
+        self.assertEqual(self.question.content_html, render_markdown(self.question.content))
+        self.assertEqual(self.answer.content_html, render_markdown(self.answer.content))
+        self.assertEqual(self.question.revision, revision + 1)
+        self.assertIn('1 questions and warmed 1 comments', out.getvalue())
+
+    def test_render_markdown_unchanged(self):
+        revision = Question.objects.get().revision
+        call_command('render_markdown', stdout=StringIO())
+        self.assertEqual(Question.objects.get().revision, revision)
+
+
+class ExplainEndpointsTestCase(TestCase):
+
+    def test_no_sequential_scans(self):
+        out = StringIO()
+        call_command('explain_endpoints', '--fail-on-scan', stdout=out)
+        self.assertNotIn('sequential scan', out.getvalue())
@@ -0,0 +1,31 @@
+from unittest import mock
+from django.test import SimpleTestCase
+from core.db import check_connection_health
+
+
+class ConnectionHealthTestCase(SimpleTestCase):
+
+    def check(self, health_checks=True, connected=True, usable=True):
+        connection = mock.Mock(
+            settings_dict={'CONN_HEALTH_CHECKS': health_checks},
+            connection=object() if connected else None,
+        )
+        connection.is_usable.return_value = usable
+        with mock.patch('core.db.connections') as connections:
+            connections.all.return_value = [connection]
+            check_connection_health()
+        return connection
+
+    def test_closes_unusable(self):
+        self.check(usable=False).close.assert_called_once_with()
+
+    def test_keeps_usable(self):
+        self.check().close.assert_not_called()
+
+    def test_disabled(self):
+        connection = self.check(health_checks=False, usable=False)
+        connection.is_usable.assert_not_called()
+        connection.close.assert_not_called()
+
+    def test_not_connected(self):
+        self.check(connected=False).is_usable.assert_not_called()
@@ -2,6 +2,7 @@ import json
 import os
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django_comments.models import Comment
 from core.models import Question, Answer
 
 
@@ -48,13 +49,75 @@ class QuestionTestCase(ModelsTestCase):
         self.assertEqual(self.question.count_answers, 2)
         self.assertEqual(self.other_question.count_answers, 0)
 
-    def test_count_votes(self):
-        self.question.votes.update_or_create(
-            user=self.other_user, defaults={'value': True}
+    def test_answer_count(self):
+        self.assertEqual(self.question.answer_count, 2)
+        self.other_answer.delete()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.answer_count, 1)
+        self.assertEqual(self.other_question.answer_count, 0)
+
+    def test_comment_count(self):
+        last_activity = self.question.last_activity_at
+        Comment.objects.create(
+            content_object=self.question, user=self.user,
+            comment='A comment.', site_id=1,
+        )
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.comment_count, 1)
+        self.assertGreater(self.question.last_activity_at, last_activity)
+        Comment.objects.get().delete()
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.comment_count, 0)
+
+    def test_answer_comment_activity(self):
+        last_activity = self.question.last_activity_at
+        Comment.objects.create(
+            content_object=self.answer, user=self.user,
+            comment='A comment.', site_id=1,
+        )
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.comment_count, 0)
+        self.assertGreater(self.question.last_activity_at, last_activity)
+
+    def test_update_total_votes(self):
+        self.question.update_total_votes(2)
+        self.assertEqual(self.question.total_votes, 2)
+        self.question.update_total_votes(-3)
+        self.assertEqual(self.question.total_votes, -1)
+
+    def test_content_html(self):
+        self.question.content = '**Bold** <script>alert(1)</script>'
+        self.question.save()
+        self.question.refresh_from_db()
+        self.assertEqual(
+            self.question.content_html,
+            '<p><strong>Bold</strong> &lt;script&gt;alert(1)&lt;/script&gt;</p>',
         )
-        self.question.count_votes()
-        self.assertEqual(self.question.total_votes, 1)
-        self.assertEqual(self.other_question.total_votes, 0)
+
+    def test_content_html_unsafe_links(self):
+        self.question.content = '[a](javascript:alert(1)) [b](https://x.org)'
+        self.question.save(update_fields=['content'])
+        self.question.refresh_from_db()
+        self.assertEqual(
+            self.question.content_html,
+            '<p><a>a</a> <a href="https://x.org">b</a></p>',
+        )
+
+    def test_content_html_encoded_schemes(self):
+        for content in [
+            '[a](&#106;avascript:alert(1))',
+            '[a](javascript&colon;alert(1))',
+            '[a](java&#9;script:alert(1))',
+            '![x](&#x6A;avascript:alert(1))',
+        ]:
+            with self.subTest(content=content):
+                self.question.content = content
+                self.question.save(update_fields=['content'])
+                self.assertNotIn('href', self.question.content_html)
+                self.assertNotIn('src', self.question.content_html)
+        self.question.content = '[a](https://x.org/?a=1&amp;b=2)'
+        self.question.save(update_fields=['content'])
+        self.assertIn('href', self.question.content_html)
 
 
 class QuestionQuerySetTestCase(ModelsTestCase):
@@ -65,6 +128,9 @@ class QuestionQuerySetTestCase(ModelsTestCase):
         )
         self.assertEqual(Question.objects.get_most_voted()[0], self.question)
 
+    def test_get_active(self):
+        self.assertEqual(Question.objects.get_active().first(), self.question)
+
     def test_get_unanswered(self):
         self.assertEqual(Question.objects.get_unanswered().first(), self.other_question)
 
@@ -75,6 +141,16 @@ class QuestionQuerySetTestCase(ModelsTestCase):
         counted_tags = {'test1': 1, 'test2': 1}
         self.assertEqual(Question.objects.get_counted_tags(), list(counted_tags.items()))
 
+    def test_get_counted_tags_ordering(self):
+        self.other_question.tags.add('test1', 'test3')
+        self.assertEqual(
+            Question.objects.get_counted_tags(),
+            [('test1', 2), ('test2', 1), ('test3', 1)]
+        )
+        self.assertEqual(
+            Question.objects.get_counted_tags(limit=1), [('test1', 2)]
+        )
+
 
 class AnswerTestCase(ModelsTestCase):
 
@@ -84,12 +160,18 @@ class AnswerTestCase(ModelsTestCase):
     def test_str(self):
         self.assertEqual(self.answer.__str__(), self.answer.content)
 
-    def test_count_votes(self):
-        self.answer.votes.update_or_create(
-            user=self.other_user, defaults={'value': True}
-        )
-        self.answer.count_votes()
-        self.assertEqual(self.answer.total_votes, 1)
+    def test_update_total_votes(self):
+        self.answer.update_total_votes(-1)
+        self.assertEqual(self.answer.total_votes, -1)
+
+    def test_content_html(self):
+        self.answer.content = '# Title'
+        self.answer.save()
+        self.assertEqual(self.answer.content_html, '<h1>Title</h1>')
+        self.answer.accepted = True
+        self.answer.save(update_fields=['accepted'])
+        self.answer.refresh_from_db()
+        self.assertEqual(self.answer.content_html, '<h1>Title</h1>')
 
     def test_accept_answer(self):
         self.other_answer.accept_answer()
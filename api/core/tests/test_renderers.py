@@ -0,0 +1,100 @@
+import datetime
+import io
+import json
+import os
+import uuid
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from core.tests.test_views import ViewsTestCase
+
+
+class FastJSONRendererTestCase(TestCase):
+
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_fixtures(self):
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        for app in ('core', 'users'):
+            with open(os.path.join(base_dir, app, 'tests', 'data.json')) as file:
+                self.assertSameOutput(json.load(file))
+
+    def test_types(self):
+        data = ReturnDict({
+            'datetime': datetime.datetime(2021, 7, 1, 12, 30, 15, 123456,
+                                          tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2021, 7, 1, 12, 30),
+            'date': datetime.date(2021, 7, 1),
+            'time': datetime.time(12, 30),
+            'timedelta': datetime.timedelta(hours=1),
+            'uuid': uuid.UUID('12345678123456781234567812345678'),
+            'decimal': Decimal('1.50'),
+            'lazy': gettext_lazy('Open'),
+            'list': ReturnList([1, 'ü', None, True], serializer=None),
+            'tuple': (1, 2),
+            'set': {3},
+            'bytes': b'raw',
+            'separators': 'a\u2028b\u2029c',
+            1: 'int key',
+        }, serializer=None)
+        self.assertSameOutput(data)
+
+    def test_indent(self):
+        self.assertSameOutput({'a': [1, 2]}, 'application/json; indent=4')
+
+    def test_big_integer(self):
+        self.assertSameOutput({'big': 2 ** 70})
+
+    def test_none(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONRendererViewsTestCase(ViewsTestCase):
+
+    def test_responses(self):
+        urls = [
+            reverse('core:question-list'),
+            reverse('core:question-detail', args=[self.question.id]),
+            reverse('users:list'),
+        ]
+        for url in urls:
+            response = self.client.get(url)
+            self.assertEqual(
+                response.content,
+                JSONRenderer().render(response.data),
+            )
+
+
+class FastJSONParserTestCase(TestCase):
+
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(
+            io.BytesIO(body), parser_context={'encoding': encoding}
+        )
+
+    def test_parse(self):
+        body = '{"title": "ü", "tags": ["a"], "big": 1180591620717411303424}'
+        for encoding in ('utf-8', 'latin-1'):
+            self.assertEqual(
+                self.parse(FastJSONParser(), body.encode(encoding), encoding),
+                self.parse(JSONParser(), body.encode(encoding), encoding),
+            )
+
+    def test_parse_error(self):
+        for body in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError) as fast:
+                self.parse(FastJSONParser(), body)
+            with self.assertRaises(ParseError) as stdlib:
+                self.parse(JSONParser(), body)
+            self.assertEqual(str(fast.exception), str(stdlib.exception))
@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from taggit.models import Tag, TaggedItem
+from core.caching import bump, get_namespace_versions
+from core.models import Question
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTestCase(APITestCase):
+    '''Uses a second SQLite file as the replica.
+
+    Nothing replicates between the files, so a row's presence shows which
+    database served the read.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        # Added here rather than on the class so the test runner doesn't try
+        # to set up a database for an alias that isn't in the settings.
+        cls.databases = {'default', 'replica'}
+        handle, cls.replica_name = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        connections.databases['replica'] = {
+            **connections.databases['default'],
+            'NAME': cls.replica_name,
+        }
+        with override_settings(DATABASE_REPLICAS=['replica']):
+            call_command('migrate', database='replica', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.databases['replica']
+        os.remove(cls.replica_name)
+
+    def setUp(self):
+        cache.clear()
+        # Namespaces start at the first read; age them past the window in
+        # which fills go to the primary.
+        with mock.patch('time.time', return_value=time.time() - 60):
+            get_namespace_versions(['questions', 'users'])
+        self.user = User.objects.create_user('writer', 'writer@mail.com', 'pass')
+        self.reader = User.objects.create_user('reader', 'reader@mail.com', 'pass')
+        replica_user = User.objects.db_manager('replica').create_user(
+            'replica', 'replica@mail.com', 'pass'
+        )
+        self.replica_question = Question.objects.using('replica').create(
+            user=replica_user, title='Replica question', content='Content'
+        )
+        self.url = reverse('core:question-list')
+
+    def get_titles(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [question['title'] for question in response.data['results']]
+
+    def test_reads_from_replica(self):
+        self.assertEqual(self.get_titles(), ['Replica question'])
+        self.client.force_authenticate(user=self.reader)
+        self.assertEqual(self.get_titles(), ['Replica question'])
+
+    def test_stream_reads_from_replica(self):
+        tag = Tag.objects.using('replica').create(name='replica', slug='replica')
+        TaggedItem.objects.using('replica').create(
+            tag=tag, object_id=self.replica_question.id,
+            content_type=ContentType.objects.db_manager('replica')
+            .get_for_model(Question),
+        )
+        url = reverse('core:tagged-questions', args=['replica'])
+        response = self.client.get(url, {'stream': 'true'})
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(
+            [question['title'] for question in data], ['Replica question']
+        )
+        self.assertEqual(data[0]['tags'], ['replica'])
+
+    def test_fill_after_bump_reads_primary(self):
+        self.assertEqual(self.get_titles(), ['Replica question'])
+        # The replica may not have the write behind the bump yet.
+        bump('questions')
+        self.assertEqual(self.get_titles(), [])
+        # Once the bump is older than the window, fills use the replica.
+        with mock.patch(
+            'time.time', return_value=time.time() - settings.REPLICA_PIN_SECONDS
+        ):
+            bump('questions')
+        self.assertEqual(self.get_titles(), ['Replica question'])
+
+    def test_writer_pinned_to_primary(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {
+            'title': 'New question', 'content': 'Content', 'tags': ['test'],
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Question.objects.filter(title='New question').exists())
+        self.assertEqual(self.get_titles(), ['New question'])
+        self.client.force_authenticate(user=self.reader)
+        self.assertEqual(self.get_titles(), ['Replica question'])
+        # The pin expires with its cache entry.
+        cache.clear()
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.get_titles(), ['Replica question'])
+
+    def test_failed_write_does_not_pin(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'title': ''})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_titles(), ['Replica question'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(self.get_titles(), [])
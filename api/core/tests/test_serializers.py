@@ -1,6 +1,8 @@
 import json
 import os
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APIRequestFactory
@@ -87,6 +89,25 @@ class AnswerListSerializerTestCase(SerializerTestCase):
         serializer = AnswerListSerializer(context={'request': self.request})
         self.assertTrue(serializer.get_downvoted(self.answer))
 
+    def test_user_votes_context(self):
+        self.request.user = self.other_user
+        content_type = ContentType.objects.get_for_model(Answer)
+        serializer = AnswerListSerializer(context={
+            'request': self.request,
+            'user_votes': {(content_type.id, self.answer.id): True},
+        })
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.get_upvoted(self.answer))
+            self.assertFalse(serializer.get_downvoted(self.answer))
+            self.assertFalse(serializer.get_upvoted(self.other_answer))
+
+    def test_anonymous_user(self):
+        self.request.user = AnonymousUser()
+        serializer = AnswerListSerializer(context={'request': self.request})
+        with self.assertNumQueries(0):
+            self.assertFalse(serializer.get_upvoted(self.answer))
+            self.assertFalse(serializer.get_downvoted(self.answer))
+
 
 class AnswerCreateSerializerTestCase(SerializerTestCase):
 
@@ -1,16 +1,24 @@
 import json
 import os
+import time
+from unittest import mock
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django_comments.models import Comment
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase, APIRequestFactory
+from taggit.models import Tag
 from core.models import Answer, Question, Vote
+from core.utils import update_votes
 
 
 class ViewsTestCase(APITestCase):
 
     def setUp(self):
+        cache.clear()
         User = get_user_model()
         base_dir = os.path.dirname(__file__)
         file_path = os.path.join(base_dir, 'data.json')
@@ -45,37 +53,597 @@ class NewestQuestionListViewTestCase(ViewsTestCase):
         pass
 
 
+class QuestionListQueriesTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(8):
+            question = Question.objects.create(
+                user=self.other_user,
+                title=f'Extra question {i}',
+                content='Extra content.',
+            )
+            question.tags.add('test1', 'extra')
+            Answer.objects.create(
+                question=question, user=self.user, content='Extra answer.'
+            )
+
+    def test_list_query_count(self):
+        urls = [
+            reverse('core:question-list'),
+            reverse('core:unaswered-questions'),
+            reverse('core:most-voted-questions'),
+        ]
+        for url in urls:
+            # count, page and tags prefetch
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_tagged_query_count(self):
+        url = reverse('core:tagged-questions', args=['test1'])
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 9)
+        self.assertEqual(len(response.data['results']), 9)
+
+    def test_count_answers(self):
+        url = reverse('core:question-list')
+        response = self.client.get(url)
+        counts = {
+            item['title']: item['count_answers']
+            for item in response.data['results']
+        }
+        self.assertEqual(counts[self.question.title], 2)
+        self.assertEqual(counts[self.other_question.title], 0)
+
+
+class SparseFieldsetTestCase(ViewsTestCase):
+
+    def test_fields(self):
+        url = reverse('core:question-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                url, {'fields': 'title,total_votes,count_answers,tags'}
+            )
+        self.assertEqual(
+            set(response.data['results'][0]),
+            {'title', 'total_votes', 'count_answers', 'tags'},
+        )
+        page_query = next(
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT "core_question"."id"')
+        )
+        self.assertNotIn('"content"', page_query)
+        self.assertNotIn('users_customuser', page_query)
+
+    def test_omit(self):
+        url = reverse('core:question-list')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'omit': 'content,content_html'})
+        result = response.data['results'][0]
+        self.assertNotIn('content', result)
+        self.assertEqual(result['user']['username'], self.user.username)
+        sql = '\n'.join(query['sql'] for query in queries.captured_queries)
+        self.assertNotIn('"content"', sql)
+
+    def test_cursor_fields(self):
+        url = reverse('core:question-list')
+        params = {'fields': 'title', 'pagination': 'cursor'}
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_detail_fields(self):
+        url = reverse('core:question-detail', args=[self.question.id])
+        response = self.client.get(url, {'fields': 'title,upvoted'})
+        self.assertEqual(dict(response.data), {
+            'title': self.question.title, 'upvoted': False,
+        })
+        etag = response['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unknown_field(self):
+        url = reverse('core:question-list')
+        response = self.client.get(url, {'omit': 'password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CursorPaginationTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            Question.objects.create(
+                user=self.other_user,
+                title=f'Extra question {i}',
+                content='Extra content.',
+                total_votes=i % 3,
+            )
+
+    def walk(self, url):
+        titles = []
+        response = self.client.get(url, {'pagination': 'cursor'})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            titles += [item['title'] for item in response.data['results']]
+            if not response.data['next']:
+                return titles, response
+            response = self.client.get(response.data['next'])
+
+    def test_newest(self):
+        titles, _ = self.walk(reverse('core:question-list'))
+        expected = Question.objects.order_by('-timestamp', '-id')
+        self.assertEqual(titles, [question.title for question in expected])
+
+    def test_most_voted(self):
+        titles, _ = self.walk(reverse('core:most-voted-questions'))
+        expected = Question.objects.order_by('total_votes', 'id')
+        self.assertEqual(titles, [question.title for question in expected])
+
+    def test_unanswered(self):
+        titles, _ = self.walk(reverse('core:unaswered-questions'))
+        self.assertEqual(len(titles), Question.objects.get_unanswered().count())
+
+    def test_previous(self):
+        url = reverse('core:question-list')
+        first = self.client.get(url, {'pagination': 'cursor'})
+        self.assertIsNone(first.data['previous'])
+        second = self.client.get(first.data['next'])
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(previous.data['results'], first.data['results'])
+        self.assertIsNone(previous.data['previous'])
+
+    def test_tagged(self):
+        titles, _ = self.walk(reverse('core:tagged-questions', args=['test1']))
+        self.assertEqual(titles, [self.question.title])
+
+    def test_invalid_cursor(self):
+        url = reverse('core:question-list')
+        response = self.client.get(url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_default(self):
+        response = self.client.get(reverse('core:question-list'))
+        self.assertEqual(response.data['count'], 14)
+
+
+class QuestionDetailViewTestCase(ViewsTestCase):
+
+    def test_retrieve_anonymous(self):
+        url = reverse('core:question-detail', args=[self.question.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['upvoted'])
+        self.assertFalse(response.data['downvoted'])
+
+    def test_retrieve_user_votes(self):
+        update_votes(self.question, self.other_user, True)
+        update_votes(self.other_answer, self.other_user, False)
+        self.client.force_authenticate(user=self.other_user)
+        url = reverse('core:question-detail', args=[self.question.id])
+        response = self.client.get(url)
+        self.assertTrue(response.data['upvoted'])
+        self.assertFalse(response.data['downvoted'])
+        answers = {
+            answer['id']: answer for answer in response.data['answer_set']
+        }
+        self.assertFalse(answers[self.answer.id]['upvoted'])
+        self.assertFalse(answers[self.answer.id]['downvoted'])
+        self.assertTrue(answers[self.other_answer.id]['downvoted'])
+
+    def test_retrieve_vote_queries(self):
+        self.client.force_authenticate(user=self.other_user)
+        url = reverse('core:question-detail', args=[self.question.id])
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        vote_queries = [
+            query for query in queries.captured_queries
+            if 'core_vote' in query['sql']
+        ]
+        self.assertEqual(len(vote_queries), 1)
+
+    def add_thread(self, answers):
+        targets = [self.question]
+        for i in range(answers):
+            targets.append(Answer.objects.create(
+                question=self.question, user=self.other_user, content=f'{i}'
+            ))
+        for target in [*targets, self.answer]:
+            for user in (self.user, self.other_user):
+                Comment.objects.create(
+                    content_object=target, user=user, comment='Comment',
+                    site_id=1,
+                )
+
+    def test_retrieve_comments(self):
+        self.add_thread(1)
+        url = reverse('core:question-detail', args=[self.question.id])
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['comment_set']), 2)
+        answers = {
+            answer['id']: answer for answer in response.data['answer_set']
+        }
+        self.assertEqual(len(answers[self.answer.id]['comment_set']), 2)
+        self.assertEqual(answers[self.other_answer.id]['comment_set'], [])
+        self.assertEqual(
+            answers[self.answer.id]['comment_set'][1]['user']['username'],
+            self.other_user.username,
+        )
+
+    def test_retrieve_query_count(self):
+        self.client.force_authenticate(user=self.other_user)
+        url = reverse('core:question-detail', args=[self.question.id])
+        for answers in (10, 20):
+            self.add_thread(answers)
+            cache.clear()
+            # Revision, question, tags, votes, the answer page, the accepted
+            # answer and comments.
+            with self.assertNumQueries(7):
+                self.client.get(url)
+
+    def test_retrieve_not_modified(self):
+        self.client.force_authenticate(user=self.other_user)
+        url = reverse('core:question-detail', args=[self.question.id])
+        response = self.client.get(url)
+        etag = response['ETag']
+        # Just the revision lookup.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Dates are only offered once the second of the last change is over.
+        self.assertNotIn('Last-Modified', response)
+        with mock.patch('time.time', return_value=time.time() + 2):
+            response = self.client.get(url)
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_etag_per_user(self):
+        url = reverse('core:question-detail', args=[self.question.id])
+        anonymous_etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_update_edited_fields(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('core:question-detail', args=[self.question.id])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.put(url, {
+                'title': 'Edited', 'content': 'Edited content.',
+                'tags': ['edited'],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "core_question" SET "title"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('total_votes', updates[0])
+        self.assertNotIn('answer_count', updates[0])
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.title, 'Edited')
+        self.assertEqual(list(self.question.tags.names()), ['edited'])
+
+    def test_partial_update_query_count(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('core:question-detail', args=[self.question.id])
+        counts = []
+        # Both threads fit on the first answer page.
+        for answers in (1, 4):
+            self.add_thread(answers)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.patch(
+                    url, {'title': f'Edited {answers}'}, format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(queries))
+        # Embedded answers, comments and vote flags don't add queries per
+        # answer.
+        self.assertEqual(counts[0], counts[1])
+
+    def test_retrieve_modified_by_children(self):
+        url = reverse('core:question-detail', args=[self.question.id])
+        changes = [
+            lambda: update_votes(self.other_answer, self.other_user, True),
+            lambda: Comment.objects.create(
+                content_object=self.answer, user=self.other_user,
+                comment='Comment', site_id=1,
+            ),
+            lambda: Answer.objects.create(
+                question=self.question, user=self.other_user, content='New'
+            ),
+            lambda: self.question.tags.add('test3'),
+            lambda: self.other_user.save(),
+            lambda: Tag.objects.filter(name='test1').get().save(),
+        ]
+        for change in changes:
+            etag = self.client.get(url)['ETag']
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class QuestionAnswerListViewTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            Answer.objects.create(
+                question=self.question, user=self.other_user,
+                content=f'Extra answer {i}', total_votes=i % 4,
+            )
+        self.url = reverse('core:question-answers', args=[self.question.id])
+
+    def walk(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [answer['id'] for answer in response.data['results']]
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_sorts(self):
+        answers = Answer.objects.filter(question=self.question)
+        for sort, ordering in Answer.SORTS.items():
+            expected = list(
+                answers.order_by(*ordering).values_list('id', flat=True)
+            )
+            for pagination in ('page', 'cursor'):
+                ids = self.walk(self.url, {'sort': sort, 'pagination': pagination})
+                self.assertEqual(ids, expected)
+
+    def test_default_sort(self):
+        response = self.client.get(self.url)
+        votes = [answer['total_votes'] for answer in response.data['results']]
+        self.assertEqual(votes, sorted(votes, reverse=True))
+
+    def test_invalid_sort(self):
+        response = self.client.get(self.url, {'sort': 'random'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_question(self):
+        url = reverse('core:question-answers', args=[0])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_detail_first_page(self):
+        self.other_answer.accept_answer()
+        url = reverse('core:question-detail', args=[self.question.id])
+        response = self.client.get(url)
+        self.assertEqual(response.data['accepted_answer']['id'], self.other_answer.id)
+        self.assertEqual(len(response.data['answer_set']), 10)
+        first_page = [answer['id'] for answer in response.data['answer_set']]
+        rest = self.walk(response.data['answers_next'], {})
+        expected = Answer.objects.filter(question=self.question).order_by(
+            *Answer.SORTS['votes']
+        ).values_list('id', flat=True)
+        self.assertEqual(first_page + rest, list(expected))
+
+
 class QuestionTaggedListViewTestCase(ViewsTestCase):
 
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            question = Question.objects.create(
+                user=self.other_user,
+                title=f'Extra question {i}',
+                content='Extra content.',
+            )
+            question.tags.add('test1')
+        self.url = reverse('core:tagged-questions', args=['test1'])
+
     def test_list(self):
-        pass
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 13)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_stream(self):
+        response = self.client.get(self.url, {'stream': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        paged = self.client.get(self.url)
+        self.assertEqual(len(data), 13)
+        self.assertEqual(data[:10], json.loads(json.dumps(paged.data['results'])))
+        self.assertEqual(data[0]['tags'], ['test1'])
+
+    def test_stream_empty(self):
+        url = reverse('core:tagged-questions', args=['missing'])
+        response = self.client.get(url, {'stream': 'true'})
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [])
 
 
 class PopularTagListViewTestCase(ViewsTestCase):
 
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('core:popular-tags')
+
     def test_list(self):
-        pass
+        self.other_question.tags.add('test1')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(
+            response.data['results'],
+            [{'name': 'test1', 'count': 2}, {'name': 'test2', 'count': 1}]
+        )
+
+    def test_list_cached(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_list_invalidated(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.tags.add('test3')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.question.tags.remove('test3')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 2)
 
 
 class QuestionVoteViewTestCase(ViewsTestCase):
 
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.other_user)
+        self.url = reverse('core:question-vote', args=[self.question.id])
+
     def test_get_serializer_class(self):
         pass
 
     def test_create(self):
-        pass
+        response = self.client.post(self.url, {'value': True})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 1)
+        self.client.post(self.url, {'value': False})
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, -1)
+        self.client.post(self.url, {'value': False})
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, -1)
 
     def test_destroy(self):
-        pass
+        update_votes(self.question, self.other_user, False)
+        update_votes(self.answer, self.other_user, True)
+        self.answer.refresh_from_db()
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 0)
+        self.assertEqual(self.answer.votes.count(), 1)
+        response = self.client.delete(self.url)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 0)
 
 
 class AnswerVoteViewTestCase(ViewsTestCase):
 
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(user=self.other_user)
+        self.url = reverse('core:answer-vote', args=[self.answer.id])
+
     def test_get_serializer_class(self):
         pass
 
     def test_create(self):
-        pass
+        response = self.client.post(self.url, {'value': False})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.answer.refresh_from_db()
+        self.assertEqual(self.answer.total_votes, -1)
+        self.client.post(self.url, {'value': True})
+        self.answer.refresh_from_db()
+        self.assertEqual(self.answer.total_votes, 1)
 
     def test_destroy(self):
-        pass
+        update_votes(self.answer, self.other_user, True)
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.answer.refresh_from_db()
+        self.assertEqual(self.answer.total_votes, 0)
+        self.assertFalse(self.answer.votes.exists())
+
+
+class BulkVoteViewTestCase(ViewsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('core:bulk-votes')
+        self.client.force_authenticate(user=self.other_user)
+
+    def item(self, obj, value=True):
+        object_type = 'question' if isinstance(obj, Question) else 'answer'
+        return {'object_type': object_type, 'object_id': obj.id, 'value': value}
+
+    def test_bulk_votes(self):
+        update_votes(self.answer, self.other_user, False)
+        data = [
+            self.item(self.question), self.item(self.answer),
+            self.item(self.other_answer), self.item(self.other_answer, False),
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {'created': 2, 'updated': 1, 'unchanged': 0}
+        )
+        self.question.refresh_from_db()
+        self.answer.refresh_from_db()
+        self.other_answer.refresh_from_db()
+        self.assertEqual(self.question.total_votes, 1)
+        self.assertEqual(self.answer.total_votes, 1)
+        self.assertEqual(self.other_answer.total_votes, -1)
+        self.assertEqual(Vote.objects.filter(user=self.other_user).count(), 3)
+
+    def test_bulk_votes_queries(self):
+        data = [
+            self.item(self.answer), self.item(self.other_answer),
+            self.item(self.question),
+        ]
+        # Savepoint, targets, locked read, insert, two totals, revisions and
+        # release.
+        with self.assertNumQueries(8):
+            self.client.post(self.url, data, format='json')
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.data['unchanged'], 3)
+
+    def test_bulk_votes_invalidates(self):
+        detail_url = reverse('core:question-detail', args=[self.question.id])
+        etag = self.client.get(detail_url)['ETag']
+        data = [self.item(self.answer)]
+        self.client.post(self.url, data, format='json')
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_votes_ownership(self):
+        self.client.force_authenticate(user=self.user)
+        data = [
+            self.item(self.other_question),
+            {'object_type': 'answer', 'object_id': 999, 'value': True},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data['non_field_errors']), 2)
+        self.assertFalse(Vote.objects.exists())
+
+    def test_bulk_votes_limit(self):
+        data = [{'object_type': 'unknown'}] * 501
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Items past the limit are never validated.
+        self.assertEqual(
+            response.data['non_field_errors'],
+            ['At most 500 votes per request.'],
+        )
+
+    def test_bulk_votes_concurrent_insert(self):
+        data = [self.item(self.answer)]
+        with mock.patch(
+            'core.serializers.bulk_update_votes',
+            side_effect=[IntegrityError, {'created': 0}],
+        ):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with mock.patch(
+            'core.serializers.bulk_update_votes', side_effect=IntegrityError
+        ):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
@@ -0,0 +1,22 @@
+from django.db import transaction
+
+
+class AtomicWriteMixin:
+    '''Runs the view's save or delete, and its signal handlers, atomically.
+
+    Requests run in autocommit, so only this critical section holds a
+    transaction. Validation and rendering stay outside it, and reads never
+    open one.
+    '''
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            super().perform_destroy(instance)
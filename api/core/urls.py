@@ -19,6 +19,11 @@ urlpatterns = [
         views.MostVotedQuestionListView.as_view({'get': 'list'}),
         name='most-voted-questions'
     ),
+    path(
+        'questions/active/',
+        views.ActiveQuestionListView.as_view({'get': 'list'}),
+        name='active-questions'
+    ),
     path(
         'questions/tagged/<str:tag>/',
         views.QuestionTaggedListView.as_view({'get': 'list'}),
@@ -30,11 +35,17 @@ urlpatterns = [
             {
                 'get': 'retrieve',
                 'put': 'update',
+                'patch': 'partial_update',
                 'delete': 'destroy'
             }
         ),
         name='question-detail'
     ),
+    path(
+        'questions/<int:pk>/answers/',
+        views.QuestionAnswerListView.as_view({'get': 'list'}),
+        name='question-answers'
+    ),
     path(
         'answers/',
         views.AnswerCreateView.as_view({'post': 'create'}),
@@ -61,6 +72,7 @@ urlpatterns = [
         views.AnswerVoteView.as_view({'post': 'create', 'delete': 'destroy'}),
         name='answer-vote'
     ),
+    path('votes/bulk/', views.BulkVoteView.as_view(), name='bulk-votes'),
     path('answers/<int:pk>/accept/', views.AcceptAnswerView.as_view(), name='accept-answer'),
     path('answers/<int:pk>/undo-accept/', views.UndoAcceptAnswerView.as_view(), name='undo-accept-answer'),
 ]
@@ -1,3 +1,20 @@
+from collections import defaultdict
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Case, CharField, F, IntegerField, Q, Value, When
+)
+from django.utils import timezone
+from django_comments.models import Comment
+from rest_framework.reverse import reverse
+from core.caching import bump
+from core.models import Answer, Question, Vote
+from core.pagination import KeysetPagination
+
+POPULAR_TAGS_CACHE_KEY = 'core:popular-tags'
+
 
 def is_owner(obj, user):
     """Checks if model instance belongs to a user."""
@@ -6,9 +23,248 @@ def is_owner(obj, user):
     return False
 
 
+def vote_weight(value):
+    """Score contribution of a vote value."""
+    return 1 if value else -1
+
+
 def update_votes(obj, user, value):
     """Updates votes for a question or answer."""
-    obj.votes.update_or_create(
-        user=user, defaults={"value": value},
+    with transaction.atomic():
+        vote, created = obj.votes.get_or_create(
+            user=user, defaults={"value": value},
+        )
+        if created:
+            obj.update_total_votes(vote_weight(value))
+            return
+        vote = obj.votes.select_for_update().get(pk=vote.pk)
+        if vote.value == value:
+            return
+        vote.value = value
+        vote.save(update_fields=["value"])
+        obj.update_total_votes(2 * vote_weight(value))
+
+
+def remove_vote(obj, user):
+    """Removes a user's vote from a question or answer."""
+    with transaction.atomic():
+        # Lock like update_votes so the weight removed is the committed one.
+        vote = obj.votes.select_for_update().filter(user=user).first()
+        if vote is None:
+            return
+        deleted, _ = obj.votes.filter(id=vote.id).delete()
+        if deleted:
+            obj.update_total_votes(-vote_weight(vote.value))
+
+
+def get_vote_targets(question_ids, answer_ids):
+    """Maps (object_type, id) to (owner id, question id) in one query."""
+    # Annotating every column keeps both halves of the UNION in one order.
+    columns = ('target_type', 'target_id', 'owner_id', 'target_question_id')
+    questions = Question.objects.filter(id__in=question_ids).annotate(
+        target_type=Value('question', output_field=CharField()),
+        target_id=F('id'), owner_id=F('user_id'), target_question_id=F('id'),
+    ).values_list(*columns).order_by()
+    answers = Answer.objects.filter(id__in=answer_ids).annotate(
+        target_type=Value('answer', output_field=CharField()),
+        target_id=F('id'), owner_id=F('user_id'),
+        target_question_id=F('question_id'),
+    ).values_list(*columns).order_by()
+    return {
+        (object_type, object_id): (user_id, question_id)
+        for object_type, object_id, user_id, question_id
+        in questions.union(answers, all=True)
+    }
+
+
+def bulk_update_votes(user, votes, question_ids):
+    """Applies a user's {(model, object id): value} votes in batched writes.
+
+    Existing votes are read and locked in one query. New ones are inserted
+    with one bulk_create and flipped ones with one UPDATE per value. Each
+    model's totals get one UPDATE with a CASE of per-object deltas.
+    `question_ids` are the questions whose pages show the voted objects.
+    """
+    content_types = ContentType.objects.get_for_models(*{
+        model for model, _ in votes
+    })
+    condition = Q(pk__in=[])
+    for model, content_type in content_types.items():
+        object_ids = [object_id for m, object_id in votes if m is model]
+        condition |= Q(content_type=content_type, object_id__in=object_ids)
+    models = {
+        content_type.id: model for model, content_type in content_types.items()
+    }
+    with transaction.atomic():
+        existing = {
+            (models[content_type_id], object_id): (vote_id, value)
+            for vote_id, content_type_id, object_id, value in (
+                Vote.objects.select_for_update().filter(user=user)
+                .filter(condition)
+                .values_list('id', 'content_type_id', 'object_id', 'value')
+            )
+        }
+        created, flipped, deltas = [], {True: [], False: []}, {}
+        unchanged = 0
+        for (model, object_id), value in votes.items():
+            if (model, object_id) not in existing:
+                created.append(Vote(
+                    user=user, content_type=content_types[model],
+                    object_id=object_id, value=value,
+                ))
+                delta = vote_weight(value)
+            else:
+                vote_id, current = existing[(model, object_id)]
+                if current == value:
+                    unchanged += 1
+                    continue
+                flipped[value].append(vote_id)
+                delta = 2 * vote_weight(value)
+            deltas.setdefault(model, {})[object_id] = delta
+        Vote.objects.bulk_create(created)
+        for value, vote_ids in flipped.items():
+            if vote_ids:
+                Vote.objects.filter(id__in=vote_ids).update(value=value)
+        for model, object_deltas in deltas.items():
+            model.objects.filter(id__in=object_deltas).update(
+                total_votes=F('total_votes') + Case(
+                    *(When(id=pk, then=Value(delta))
+                      for pk, delta in object_deltas.items()),
+                    default=Value(0), output_field=IntegerField(),
+                )
+            )
+        if deltas:
+            question_content_changed(question_ids)
+    return {
+        'created': len(created),
+        'updated': len(flipped[True]) + len(flipped[False]),
+        'unchanged': unchanged,
+    }
+
+
+def get_user_votes(user, question_id):
+    """Maps the user's votes on a question and its answers in one query."""
+    if not user.is_authenticated:
+        return {}
+    question_type = ContentType.objects.get_for_model(Question)
+    answer_type = ContentType.objects.get_for_model(Answer)
+    answer_ids = Answer.objects.filter(question_id=question_id).values('id')
+    votes = Vote.objects.filter(user=user).filter(
+        Q(content_type=question_type, object_id=question_id) |
+        Q(content_type=answer_type, object_id__in=answer_ids)
+    ).values_list('content_type_id', 'object_id', 'value')
+    return {
+        (content_type_id, object_id): value
+        for content_type_id, object_id, value in votes
+    }
+
+
+def get_thread_comments(answer_ids, question_id=None):
+    """Maps the comments on answers, and optionally a question, in one query.
+
+    Keys are `(content_type_id, object_pk)`, with the comment authors
+    already joined. `object_pk` is a text column, hence the string ids.
+    """
+    answer_type = ContentType.objects.get_for_model(Answer)
+    thread_filter = Q(
+        content_type=answer_type,
+        object_pk__in=[str(answer_id) for answer_id in answer_ids],
+    )
+    if question_id is not None:
+        question_type = ContentType.objects.get_for_model(Question)
+        thread_filter |= Q(content_type=question_type, object_pk=str(question_id))
+    thread = defaultdict(list)
+    for comment in Comment.objects.select_related('user').filter(thread_filter):
+        thread[(comment.content_type_id, comment.object_pk)].append(comment)
+    return thread
+
+
+def get_answer_page(question_id, request):
+    """The accepted answer and the first page of answers by votes.
+
+    `next` links to the rest on `/questions/<pk>/answers/`.
+    """
+    answers = Answer.objects.filter(question_id=question_id)
+    paginator = KeysetPagination()
+    paginator.base_url = reverse(
+        'core:question-answers', args=[question_id], request=request
+    )
+    paginator.set_ordering(Answer, Answer.SORTS['votes'])
+    page = paginator.get_page(answers, None)
+    accepted = next((answer for answer in page if answer.accepted), None)
+    if accepted is None and paginator.has_next:
+        accepted = answers.filter(accepted=True).first()
+    return {
+        'accepted': accepted,
+        'page': page,
+        'next': paginator.get_next_link(),
+    }
+
+
+def get_popular_tags():
+    """Returns the cached (name, count) leaderboard of question tags."""
+    popular_tags = cache.get(POPULAR_TAGS_CACHE_KEY)
+    if popular_tags is None:
+        popular_tags = Question.objects.get_counted_tags(
+            limit=settings.POPULAR_TAGS_LIMIT
+        )
+        cache.set(
+            POPULAR_TAGS_CACHE_KEY, popular_tags, settings.POPULAR_TAGS_TIMEOUT
+        )
+    return popular_tags
+
+
+def clear_popular_tags():
+    """Invalidates the popular tags leaderboard."""
+    cache.delete(POPULAR_TAGS_CACHE_KEY)
+
+
+def update_question_activity(questions, answers=0, comments=0, touch=True):
+    """Applies counter deltas to a question queryset in one UPDATE."""
+    updates = {}
+    if answers:
+        updates['answer_count'] = F('answer_count') + answers
+    if comments:
+        updates['comment_count'] = F('comment_count') + comments
+    if touch:
+        updates['last_activity_at'] = timezone.now()
+    if updates:
+        questions.update(**updates)
+
+
+def update_comment_activity(comment, delta):
+    """Counts a created (+1) or deleted (-1) comment on its question."""
+    model = comment.content_type.model_class()
+    if model is Question:
+        questions = Question.objects.filter(id=comment.object_pk)
+        update_question_activity(questions, comments=delta, touch=delta > 0)
+    elif model is Answer and delta > 0:
+        questions = Question.objects.filter(answer__id=comment.object_pk)
+        update_question_activity(questions)
+
+
+def get_question_ids(content_type, object_id):
+    """Ids of the question a question or answer id belongs to."""
+    model = content_type.model_class() if content_type else None
+    if model is Question:
+        return [int(object_id)]
+    if model is Answer:
+        return list(Answer.objects.filter(id=object_id).values_list(
+            'question_id', flat=True
+        ))
+    return []
+
+
+def question_content_changed(question_ids):
+    """Invalidates cached pages and revisions of the given questions."""
+    namespaces = ['questions', *(f'question:{pk}' for pk in question_ids)]
+    # Bump after commit so a concurrent read can't re-cache the old rows.
+    transaction.on_commit(lambda: bump(*namespaces))
+    revise_questions(question_ids)
+
+
+def revise_questions(question_ids):
+    """Bumps the revision of questions whose detail payload changed."""
+    Question.objects.filter(id__in=question_ids).update(
+        revision=F('revision') + 1, updated_at=timezone.now()
     )
-    obj.count_votes()
\ No newline at end of file
@@ -1,17 +1,30 @@
 from django.contrib.contenttypes.models import ContentType
 from rest_framework import mixins, permissions, status, views, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from django_comments.models import Comment
 from taggit.models import Tag
+from core.caching import CachedResponseMixin, cache_response
+from core.fieldsets import SparseFieldsetMixin
 from core.models import Question, Answer, Vote
+from core.pagination import CursorPaginationMixin, StreamingListMixin
 from core.permissions import OwnerOrReadOnly, IsOriginalPoster
+from core.replicas import ReplicaReadMixin
 from core.serializers import *
-
-
-class NewestQuestionListView(mixins.CreateModelMixin, mixins.ListModelMixin,
-                             viewsets.GenericViewSet):
-    queryset = Question.objects.all()
+from core.transactions import AtomicWriteMixin
+from core.utils import (
+    get_answer_page, get_popular_tags, get_thread_comments, get_user_votes,
+    remove_vote
+)
+
+
+class NewestQuestionListView(ReplicaReadMixin, AtomicWriteMixin,
+                             SparseFieldsetMixin, CachedResponseMixin,
+                             CursorPaginationMixin, mixins.CreateModelMixin,
+                             mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = Question.objects.with_list_data()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    cache_namespaces = ('questions', 'users')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -20,51 +33,151 @@ class NewestQuestionListView(mixins.CreateModelMixin, mixins.ListModelMixin,
             return QuestionCreateSerializer
 
 
-class UnasweredQuestionListView(viewsets.ReadOnlyModelViewSet):
-    queryset = Question.objects.get_unanswered()
+class UnasweredQuestionListView(ReplicaReadMixin, SparseFieldsetMixin,
+                                CachedResponseMixin, CursorPaginationMixin,
+                                viewsets.ReadOnlyModelViewSet):
+    queryset = Question.objects.get_unanswered().with_list_data()
     serializer_class = QuestionListSerializer
+    cache_namespaces = ('questions', 'users')
 
 
-class MostVotedQuestionListView(viewsets.ReadOnlyModelViewSet):
-    queryset = Question.objects.get_most_voted()
+class MostVotedQuestionListView(ReplicaReadMixin, SparseFieldsetMixin,
+                                CachedResponseMixin, CursorPaginationMixin,
+                                viewsets.ReadOnlyModelViewSet):
+    queryset = Question.objects.get_most_voted().with_list_data()
     serializer_class = QuestionListSerializer
+    cursor_ordering = ('total_votes', 'id')
+    cache_namespaces = ('questions', 'users')
 
 
-class QuestionTaggedListView(viewsets.ReadOnlyModelViewSet):
-    queryset = Question.objects.all()
+class ActiveQuestionListView(ReplicaReadMixin, SparseFieldsetMixin,
+                             CachedResponseMixin, CursorPaginationMixin,
+                             viewsets.ReadOnlyModelViewSet):
+    queryset = Question.objects.get_active().with_list_data()
     serializer_class = QuestionListSerializer
+    cursor_ordering = ('-last_activity_at', '-id')
+    cache_namespaces = ('questions', 'users')
 
-    def list(self, request, tag):
-        queryset = Question.objects.get_tagged(tag)
-        serializer = QuestionListSerializer(
-            queryset,
-            many=True,
-            context={'request': request}
-        )
-        return Response(serializer.data)
+
+class QuestionTaggedListView(ReplicaReadMixin, SparseFieldsetMixin,
+                             CachedResponseMixin, StreamingListMixin,
+                             CursorPaginationMixin,
+                             viewsets.ReadOnlyModelViewSet):
+    queryset = Question.objects.with_list_data()
+    serializer_class = QuestionListSerializer
+    cache_namespaces = ('questions', 'users')
+
+    def get_queryset(self):
+        return Question.objects.get_tagged(self.kwargs['tag']).with_list_data()
 
 
-class QuestionDetailView(viewsets.ModelViewSet):
-    queryset = Question.objects.all()
+class QuestionDetailView(ReplicaReadMixin, AtomicWriteMixin,
+                         SparseFieldsetMixin, CachedResponseMixin,
+                         viewsets.ModelViewSet):
+    queryset = Question.objects.with_detail_data()
     serializer_class = QuestionDetailSerializer
     permission_classes = [OwnerOrReadOnly]
+    cache_namespaces = ('question:{pk}', 'users', 'tag-names')
+    # Actions whose response embeds the first page of answers.
+    embed_actions = ('retrieve', 'update', 'partial_update')
+
+    def get_cache_version(self):
+        # The question's revision covers its answers, votes and comments, and
+        # is checked before any serializer work so polling clients get a 304
+        # for the price of a single-row lookup. Users and tag names shown on
+        # the page are covered by the cache namespaces.
+        version = (
+            Question.objects.filter(pk=self.kwargs['pk']).order_by()
+            .values_list('revision', 'updated_at').first()
+        )
+        if version is None:
+            raise NotFound
+        revision, updated_at = version
+        return revision, updated_at.timestamp()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action in self.embed_actions:
+            context['user_votes'] = get_user_votes(
+                self.request.user, self.kwargs['pk']
+            )
+        if self.action in self.embed_actions:
+            selected = self.get_sparse_fields()
+            nested = {'accepted_answer', 'answer_set', 'answers_next', 'comment_set'}
+            if selected is None or selected & nested:
+                context['answers'] = get_answer_page(
+                    self.kwargs['pk'], self.request
+                )
+                answer_ids = {answer.id for answer in context['answers']['page']}
+                if context['answers']['accepted'] is not None:
+                    answer_ids.add(context['answers']['accepted'].id)
+                context['thread_comments'] = get_thread_comments(
+                    answer_ids, self.kwargs['pk']
+                )
+        return context
+
+
+class QuestionAnswerListView(ReplicaReadMixin, CachedResponseMixin,
+                             CursorPaginationMixin, mixins.ListModelMixin,
+                             viewsets.GenericViewSet):
+    '''Pages through a question's answers, sorted with `?sort=`.'''
+    serializer_class = AnswerListSerializer
+    cache_namespaces = ('question:{pk}', 'users')
+    sort_query_param = 'sort'
+    default_sort = 'votes'
+
+    @property
+    def cursor_ordering(self):
+        sort = self.request.query_params.get(self.sort_query_param, self.default_sort)
+        if sort not in Answer.SORTS:
+            message = f'Choose one of: {", ".join(Answer.SORTS)}.'
+            raise ValidationError({self.sort_query_param: [message]})
+        return Answer.SORTS[sort]
+
+    def get_queryset(self):
+        return Answer.objects.filter(
+            question_id=self.kwargs['pk']
+        ).order_by(*self.cursor_ordering)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page and not Question.objects.filter(pk=self.kwargs['pk']).exists():
+            raise NotFound
+        self.page_answer_ids = [answer.id for answer in page]
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['user_votes'] = get_user_votes(
+            self.request.user, self.kwargs['pk']
+        )
+        context['thread_comments'] = get_thread_comments(self.page_answer_ids)
+        return context
 
 
-class AnswerCreateView(viewsets.ModelViewSet):
+class AnswerCreateView(AtomicWriteMixin, viewsets.ModelViewSet):
     queryset = Answer.objects.all()
     serializer_class = AnswerCreateSerializer
 
 
-class TagListView(viewsets.ReadOnlyModelViewSet):
+class TagListView(ReplicaReadMixin, CachedResponseMixin,
+                  viewsets.ReadOnlyModelViewSet):
     queryset = Tag.objects.order_by('name')
     serializer_class = TagListSerializer
+    cache_namespaces = ('tags',)
 
 
-class PopularTagListView(viewsets.ViewSet):
+class PopularTagListView(ReplicaReadMixin, viewsets.GenericViewSet):
+    serializer_class = CountedTagsSerializer
 
+    @cache_response('tags')
     def list(self, request):
-        counted_tags = Question.objects.get_counted_tags()
-        serializer = CountedTagsSerializer(counted_tags, many=True)
+        counted_tags = get_popular_tags()
+        page = self.paginate_queryset(counted_tags)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(counted_tags, many=True)
         return Response(serializer.data)
 
 
@@ -97,12 +210,8 @@ class QuestionVoteView(viewsets.ModelViewSet):
         )
 
     def destroy(self, request, *args, **kwargs):
-        user = request.user
-        question_id = kwargs.get('pk')
-        vote = Vote.objects.filter(user=user, object_id=question_id)
-        vote.delete()
-        question = Question.objects.get(id=question_id)
-        question.count_votes()
+        question = Question.objects.get(id=kwargs.get('pk'))
+        remove_vote(question, request.user)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -133,16 +242,22 @@ class AnswerVoteView(viewsets.ModelViewSet):
         )
 
     def destroy(self, request, *args, **kwargs):
-        user = request.user
-        answer_id = kwargs.get('pk')
-        vote = Vote.objects.filter(user=user, object_id=answer_id)
-        vote.delete()
-        answer = Answer.objects.get(id=answer_id)
-        answer.count_votes()
-        print(answer.total_votes)
+        answer = Answer.objects.get(id=kwargs.get('pk'))
+        remove_vote(answer, request.user)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class BulkVoteView(views.APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = BulkVoteSerializer(
+            data=request.data, many=True, context={'user': request.user}
+        )
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save(), status=status.HTTP_200_OK)
+
+
 class AcceptAnswerView(views.APIView):
     permission_classes = [IsOriginalPoster]
 
@@ -161,13 +276,15 @@ class UndoAcceptAnswerView(views.APIView):
         return Response({'status': 'false'}, status=status.HTTP_200_OK)
 
 
-class CommentCreateView(mixins.CreateModelMixin, viewsets.GenericViewSet):
+class CommentCreateView(AtomicWriteMixin, mixins.CreateModelMixin,
+                        viewsets.GenericViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class CommentEditView(mixins.DestroyModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet):
+class CommentEditView(AtomicWriteMixin, mixins.DestroyModelMixin,
+                      mixins.UpdateModelMixin, viewsets.GenericViewSet):
     queryset = Comment.objects.all()
     permission_classes = [OwnerOrReadOnly]
 
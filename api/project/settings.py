@@ -11,7 +11,8 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 from datetime import timedelta
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -61,6 +62,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.replicas.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'project.urls'
@@ -87,14 +89,64 @@ WSGI_APPLICATION = 'project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Requests run in autocommit; writes open their own transactions around the
+# statements that must succeed together (see core.transactions).
+
 DATABASES = {
-'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-        'ATOMIC_REQUESTS': True,
+    'default': {
+        'ENGINE': config('DATABASE_ENGINE', default='django.db.backends.sqlite3'),
+        'NAME': config('DATABASE_NAME', default=BASE_DIR / 'db.sqlite3'),
+        'USER': config('DATABASE_USER', default=''),
+        'PASSWORD': config('DATABASE_PASSWORD', default=''),
+        'HOST': config('DATABASE_HOST', default=''),
+        'PORT': config('DATABASE_PORT', default=''),
+        # Seconds to keep a connection open for later requests; 0 closes it
+        # after each request.
+        'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=0, cast=int),
+        # Check reused connections at the start of each request (core.db).
+        'CONN_HEALTH_CHECKS': config(
+            'DATABASE_CONN_HEALTH_CHECKS', default=False, cast=bool
+        ),
     }
 }
 
+# Connection pooling through django-db-connection-pool, which is optional.
+# Pooled connections go back to the pool after each request, so
+# CONN_MAX_AGE is ignored.
+
+DATABASE_POOL_SIZE = config('DATABASE_POOL_SIZE', default=0, cast=int)
+if DATABASE_POOL_SIZE:
+    vendor = DATABASES['default']['ENGINE'].rsplit('.', 1)[-1]
+    if vendor not in ('postgresql', 'mysql', 'oracle'):
+        raise ImproperlyConfigured(f'Connection pooling is not supported for {vendor}.')
+    DATABASES['default'].update({
+        'ENGINE': f'dj_db_conn_pool.backends.{vendor}',
+        'CONN_MAX_AGE': 0,
+        'POOL_OPTIONS': {
+            'POOL_SIZE': DATABASE_POOL_SIZE,
+            'MAX_OVERFLOW': config('DATABASE_POOL_MAX_OVERFLOW', default=10, cast=int),
+            'RECYCLE': config('DATABASE_POOL_RECYCLE', default=3600, cast=int),
+        },
+    })
+
+# Read replicas, as a comma separated list of database names (SQLite files
+# here) that mirror the primary. Read-only API actions are served from them,
+# except for users who wrote in the last REPLICA_PIN_SECONDS and response
+# cache fills that soon after an invalidation.
+
+DATABASE_REPLICAS = []
+for index, name in enumerate(config('DATABASE_REPLICA_NAMES', default='', cast=Csv())):
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': name,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -109,6 +161,39 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# Password hashing
+# New passwords use PASSWORD_HASHER and the costs below. Hashes made with
+# another hasher or cost are rehashed on the user's next successful login.
+
+PASSWORD_HASHER = config(
+    'PASSWORD_HASHER', default='users.hashers.PBKDF2PasswordHasher'
+)
+PASSWORD_HASHERS = [PASSWORD_HASHER] + [
+    hasher for hasher in [
+        'users.hashers.PBKDF2PasswordHasher',
+        'users.hashers.ScryptPasswordHasher',
+        'users.hashers.Argon2PasswordHasher',
+    ]
+    if hasher != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS = config(
+    'PASSWORD_PBKDF2_ITERATIONS', default=260000, cast=int
+)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config(
+    'PASSWORD_ARGON2_MEMORY_COST', default=102400, cast=int
+)
+PASSWORD_ARGON2_PARALLELISM = config(
+    'PASSWORD_ARGON2_PARALLELISM', default=8, cast=int
+)
+PASSWORD_SCRYPT_WORK_FACTOR = config(
+    'PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14, cast=int
+)
+PASSWORD_SCRYPT_BLOCK_SIZE = config('PASSWORD_SCRYPT_BLOCK_SIZE', default=8, cast=int)
+PASSWORD_SCRYPT_PARALLELISM = config(
+    'PASSWORD_SCRYPT_PARALLELISM', default=1, cast=int
+)
+
 AUTHENTICATION_BACKENDS = [
     'users.backends.CustomBackend'
 ]
@@ -121,6 +206,13 @@ LOGIN_URL = 'users.login'
 
 EMAIL_BACKEND = config('EMAIL_BACKEND')
 
+# Outgoing mail is queued and sent by `manage.py send_queued_emails`.
+EMAIL_QUEUE_BATCH_SIZE = config('EMAIL_QUEUE_BATCH_SIZE', default=100, cast=int)
+EMAIL_QUEUE_MAX_ATTEMPTS = config('EMAIL_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_QUEUE_RETRY_DELAY = config('EMAIL_QUEUE_RETRY_DELAY', default=60, cast=int)
+# Seconds a worker owns the emails it claimed before others may retry them.
+EMAIL_QUEUE_CLAIM_TIMEOUT = config('EMAIL_QUEUE_CLAIM_TIMEOUT', default=300, cast=int)
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -145,6 +237,40 @@ STATIC_URL = config('STATIC_URL')
 MEDIA_ROOT = Path.joinpath(BASE_DIR, 'media')
 MEDIA_URL = config('MEDIA_URL')
 
+# Cache
+# Any Django cache backend works, e.g. a Redis backend for shared caches.
+
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Popular tags leaderboard
+
+POPULAR_TAGS_LIMIT = config('POPULAR_TAGS_LIMIT', default=100, cast=int)
+POPULAR_TAGS_TIMEOUT = config('POPULAR_TAGS_TIMEOUT', default=3600, cast=int)
+
+# Votes
+
+BULK_VOTES_LIMIT = config('BULK_VOTES_LIMIT', default=500, cast=int)
+
+# Search
+
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+SEARCH_SUGGESTIONS_LIMIT = config('SEARCH_SUGGESTIONS_LIMIT', default=10, cast=int)
+
+# Markdown
+
+# Bump to re-render stored HTML with `manage.py render_markdown`.
+MARKDOWN_RENDERER_VERSION = 2
+
 # Sites
 
 SITE_ID = 1
@@ -158,7 +284,16 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.JWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        config('JSON_RENDERER', default='core.renderers.FastJSONRenderer'),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        config('JSON_PARSER', default='core.parsers.FastJSONParser'),
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -171,4 +306,8 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'UPDATE_LAST_LOGIN': True,
-}
\ No newline at end of file
+}
+
+# Build request.user from the token's claims instead of loading it on every
+# authenticated request. Claims stay as issued until the token expires.
+JWT_TOKEN_USER = config('JWT_TOKEN_USER', default=False, cast=bool)
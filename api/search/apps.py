@@ -5,3 +5,6 @@ from django.utils.translation import ugettext_lazy as _
 class SearchConfig(AppConfig):
     name = "search"
     verbose_name = _("Search")
+
+    def ready(self):
+        import search.signals  # noqa: F401
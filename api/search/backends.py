@@ -0,0 +1,93 @@
+import re
+from abc import ABC, abstractmethod
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from search.models import SearchDocument
+
+TERM_RE = re.compile(r'\w+')
+
+
+class BaseSearchBackend(ABC):
+    '''Interface for ranked full-text search over SearchDocument rows.'''
+
+    @abstractmethod
+    def search(self, query):
+        """Returns a SearchDocument queryset, best matches first."""
+
+
+class LikeSearchBackend(BaseSearchBackend):
+    '''Unindexed LIKE scan, used on databases without full-text support.'''
+
+    def search(self, query):
+        return SearchDocument.objects.filter(
+            Q(title__icontains=query) | Q(body__icontains=query)
+        ).order_by('id')
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    '''FTS5 index ranked with bm25, title hits weighted above body hits.'''
+    table = 'search_searchdocument_fts'
+
+    def build_match(self, query):
+        terms = TERM_RE.findall(query)
+        if not terms:
+            return None
+        # Quote every term so user input can't inject FTS5 syntax, and
+        # prefix-match the last one for search-as-you-type.
+        phrases = [f'"{term}"' for term in terms]
+        phrases[-1] += '*'
+        return ' '.join(phrases)
+
+    def search(self, query):
+        match = self.build_match(query)
+        if match is None:
+            return SearchDocument.objects.none()
+        return SearchDocument.objects.extra(
+            select={'rank': f'bm25({self.table}, 10.0, 1.0)'},
+            tables=[self.table],
+            where=[
+                f'{self.table} MATCH %s',
+                f'{self.table}.rowid = search_searchdocument.id',
+            ],
+            params=[match],
+            order_by=['rank', 'id'],
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    '''tsvector search backed by the search_document_vector GIN index.'''
+    config = 'english'
+
+    def search(self, query):
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector
+        )
+
+        vector = (
+            SearchVector('title', weight='A', config=self.config) +
+            SearchVector('body', weight='B', config=self.config)
+        )
+        search_query = SearchQuery(
+            query, config=self.config, search_type='websearch'
+        )
+        return (
+            SearchDocument.objects
+            .annotate(document=vector, rank=SearchRank(vector, search_query))
+            .filter(document=search_query)
+            .order_by('-rank', 'id')
+        )
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    """Returns the configured backend, or the best one for the database."""
+    if settings.SEARCH_BACKEND:
+        return import_string(settings.SEARCH_BACKEND)()
+    return VENDOR_BACKENDS.get(connection.vendor, LikeSearchBackend)()
@@ -0,0 +1,92 @@
+import random
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from core.models import Question
+from search.backends import LikeSearchBackend, get_search_backend
+from search.utils import rebuild_index
+
+WORDS = (
+    'django python query index cache model view serializer field migration '
+    'request response token user tag answer vote database sqlite postgres '
+    'join filter annotate aggregate prefetch select transaction signal '
+    'template form admin test fixture settings middleware router url'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the indexed search backend with the LIKE scan on a '
+        'generated corpus. Everything is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--query', action='append', dest='queries',
+            help='Query to time, may be repeated.',
+        )
+
+    def sentence(self, length):
+        return ' '.join(random.choice(WORDS) for _ in range(length))
+
+    def generate(self, count):
+        user = get_user_model().objects.create_user(
+            username='benchmark', email='benchmark@example.com'
+        )
+        questions = [
+            Question(
+                user=user,
+                title=f'{self.sentence(6)} {number}',
+                content=self.sentence(80),
+            )
+            for number in range(count)
+        ]
+        Question.objects.bulk_create(questions, batch_size=5000)
+
+    def time(self, run, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            run()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def like_page(self, query):
+        # The LIKE path search used before the full-text index.
+        questions = Question.objects.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(tags__name__icontains=query)
+        ).distinct()
+        return questions.count(), list(questions[:10])
+
+    def backend_page(self, backend, query):
+        documents = backend.search(query)
+        return documents.count(), list(documents[:10])
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        queries = options['queries'] or ['django', 'prefetch cache', 'sqlite join']
+        repeat = options['repeat']
+        backend = get_search_backend()
+        if isinstance(backend, LikeSearchBackend):
+            self.stderr.write('No full-text backend for this database.')
+        with transaction.atomic():
+            self.generate(options['questions'])
+            rebuild_index()
+            self.stdout.write(
+                f'{options["questions"]} questions, '
+                f'{backend.__class__.__name__}, mean of {repeat} runs'
+            )
+            for query in queries:
+                like = self.time(lambda: self.like_page(query), repeat)
+                indexed = self.time(
+                    lambda: self.backend_page(backend, query), repeat
+                )
+                self.stdout.write(
+                    f'{query!r}: LIKE {like:.1f} ms, '
+                    f'indexed {indexed:.1f} ms ({like / indexed:.1f}x)'
+                )
+            transaction.set_rollback(True)
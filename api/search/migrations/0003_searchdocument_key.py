@@ -0,0 +1,42 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:10
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+search_index = import_module('search.migrations.0002_search_index')
+
+
+def recreate_triggers(apps, schema_editor):
+    # Adding a column rebuilds the table on SQLite, which drops the
+    # triggers that keep the FTS5 index in sync.
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in search_index.SQLITE_FORWARDS[1:]:
+            schema_editor.execute(sql)
+
+
+def fill_keys(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    documents = []
+    for document in SearchDocument.objects.only('title').iterator():
+        document.key = ' '.join(document.title.lower().split())
+        documents.append(document)
+    SearchDocument.objects.bulk_update(documents, ['key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, recreate_triggers),
+        migrations.AddField(
+            model_name='searchdocument',
+            name='key',
+            field=models.CharField(db_index=True, default='', max_length=255),
+        ),
+        migrations.RunPython(recreate_triggers, migrations.RunPython.noop),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+    ]
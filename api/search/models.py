@@ -0,0 +1,31 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class SearchDocument(models.Model):
+    '''Denormalized searchable text for a question, answer, tag or user.
+
+    The full-text index itself lives in the database (an FTS5 table on
+    SQLite, a GIN expression index on PostgreSQL) and is created by the
+    search migrations.
+    '''
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    # Lowercased title, range-scanned for autocomplete prefixes.
+    key = models.CharField(max_length=255, db_index=True, default='')
+
+    class Meta:
+        verbose_name = _('Search document')
+        verbose_name_plural = _('Search documents')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id'], name='unique search document')
+        ]
+
+    def __str__(self):
+        return self.title
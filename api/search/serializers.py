@@ -0,0 +1,11 @@
+from rest_framework import serializers
+from search.models import SearchDocument
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source='content_type.model')
+    id = serializers.IntegerField(source='object_id')
+
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'id', 'title']
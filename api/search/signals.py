@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from taggit.models import Tag, TaggedItem
+from core.models import Answer, Question
+from search.utils import index_instance, remove_instance, touches_index
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_save, sender=Answer)
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=get_user_model())
+def index_saved(sender, instance, update_fields=None, **kwargs):
+    # Logins, accepted answers and the like only touch columns that are
+    # not searchable; skip rebuilding (and the tags query) for them.
+    if touches_index(sender, update_fields):
+        index_instance(instance)
+
+
+@receiver(post_delete, sender=Question)
+@receiver(post_delete, sender=Answer)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=get_user_model())
+def remove_deleted(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+@receiver(post_save, sender=TaggedItem)
+@receiver(post_delete, sender=TaggedItem)
+def reindex_tagged(sender, instance, **kwargs):
+    if instance.content_type.model_class() is not Question:
+        return
+    question = Question.objects.filter(pk=instance.object_id).first()
+    if question is not None:
+        index_instance(question)
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.models import Answer, Question
+from search.backends import (
+    BaseSearchBackend, LikeSearchBackend, SQLiteSearchBackend
+)
+from search.models import SearchDocument
+from search.utils import rebuild_index
+
+
+class SearchBackendTestCase(TestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='searcher', email='searcher@mail.com', bio='Python dev'
+        )
+        self.question = Question.objects.create(
+            user=self.user,
+            title='How to cache querysets',
+            content='Looking for a way to cache Django querysets.',
+        )
+        self.question.tags.add('orm')
+        self.other_question = Question.objects.create(
+            user=self.user,
+            title='Template inheritance',
+            content='Why does my template not cache?',
+        )
+        self.answer = Answer.objects.create(
+            question=self.other_question,
+            user=self.user,
+            content='Use the cached template loader.',
+        )
+        self.backend = SQLiteSearchBackend()
+
+    def results(self, query, backend=None):
+        documents = (backend or self.backend).search(query)
+        return [(doc.content_type.model, doc.object_id) for doc in documents]
+
+    def test_signals_index(self):
+        self.assertEqual(SearchDocument.objects.count(), 5)
+        self.assertIn(('question', self.question.id), self.results('queryset'))
+        self.assertIn(('tag', self.question.tags.get().id), self.results('orm'))
+        self.assertIn(('customuser', self.user.id), self.results('python'))
+
+    def test_ranking(self):
+        results = self.results('cache')
+        self.assertEqual(results[0], ('question', self.question.id))
+        self.assertIn(('question', self.other_question.id), results)
+        self.assertIn(('answer', self.answer.id), results)
+
+    def test_prefix(self):
+        self.assertIn(('question', self.question.id), self.results('quer'))
+
+    def test_update_and_delete(self):
+        self.question.title = 'Renamed question'
+        self.question.save()
+        self.assertIn(('question', self.question.id), self.results('renamed'))
+        self.question.tags.remove('orm')
+        self.assertNotIn(('question', self.question.id), self.results('orm'))
+        self.question.delete()
+        self.assertEqual(self.results('renamed'), [])
+
+    def test_unindexed_update_fields(self):
+        self.question.has_answer = True
+        with CaptureQueriesContext(connection) as queries:
+            self.question.save(update_fields=['has_answer'])
+            self.user.save(update_fields=['last_login'])
+        self.assertFalse(any(
+            'search_searchdocument' in query['sql'] for query in queries
+        ))
+        self.user.bio = 'Go dev'
+        self.user.save(update_fields=['bio'])
+        self.assertIn(('customuser', self.user.id), self.results('go'))
+
+    def test_syntax_is_escaped(self):
+        self.assertEqual(self.results('"AND OR ('), [])
+        self.assertEqual(self.results('***'), [])
+
+    def test_incomplete_backend(self):
+        class IncompleteBackend(BaseSearchBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            IncompleteBackend()
+
+    def test_like_backend(self):
+        results = self.results('cache', LikeSearchBackend())
+        self.assertIn(('question', self.question.id), results)
+
+    def test_rebuild_index(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(rebuild_index(batch_size=2), 5)
+        self.assertIn(('question', self.question.id), self.results('queryset'))
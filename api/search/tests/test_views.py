@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from core.models import Answer, Question
+
+
+class SearchListViewTestCase(APITestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='searcher', email='searcher@mail.com'
+        )
+        self.question = Question.objects.create(
+            user=self.user, title='Cache querysets', content='How to cache?'
+        )
+        self.answer = Answer.objects.create(
+            question=self.question, user=self.user, content='Cache it.'
+        )
+        self.url = reverse('search:results')
+
+    def test_login_required(self):
+        response = self.client.get(self.url, {'query': 'cache'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {'query': 'cache'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertIn(
+            {'type': 'question', 'id': self.question.id, 'title': 'Cache querysets'},
+            response.data['results']
+        )
+
+    def test_type_filter(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {'query': 'cache', 'type': 'answer'})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['id'], self.answer.id)
+
+
+class SuggestionsViewTestCase(APITestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='cacher', email='cacher@mail.com', is_active=True
+        )
+        self.question = Question.objects.create(
+            user=self.user, title='Cache querysets', content='How to cache?'
+        )
+        self.question.tags.add('caching')
+        Answer.objects.create(
+            question=self.question, user=self.user, content='Cache it.'
+        )
+        self.url = reverse('search:suggestions')
+
+    def test_suggestions(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'term': 'CAC'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [
+            {'type': 'question', 'id': self.question.id,
+             'label': 'Cache querysets', 'value': 'Cache querysets'},
+            {'type': 'customuser', 'id': self.user.id,
+             'label': 'cacher', 'value': 'cacher'},
+            {'type': 'tag', 'id': self.question.tags.get().id,
+             'label': 'caching', 'value': 'caching'},
+        ])
+
+    def test_suggestions_limit(self):
+        self.client.force_login(self.user)
+        with self.settings(SEARCH_SUGGESTIONS_LIMIT=1):
+            response = self.client.get(self.url, {'term': 'cac'})
+        self.assertEqual(len(response.json()), 1)
+
+    def test_empty_term(self):
+        self.client.force_login(self.user)
+        response = self.client.get(self.url, {'term': '  '})
+        self.assertEqual(response.json(), [])
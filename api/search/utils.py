@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import Tag
+from core.models import Answer, Question
+from search.models import SearchDocument
+
+
+def question_document(question):
+    tags = ' '.join(tag.name for tag in question.tags.all())
+    return question.title, f'{question.content}\n{tags}'
+
+
+def answer_document(answer):
+    return answer.question.title, answer.content
+
+
+def tag_document(tag):
+    return tag.name, ''
+
+
+def user_document(user):
+    return user.username, f'{user.get_full_name}\n{user.bio or ""}'
+
+
+def get_document_builders():
+    return {
+        Question: question_document,
+        Answer: answer_document,
+        Tag: tag_document,
+        get_user_model(): user_document,
+    }
+
+
+def get_indexed_fields():
+    """Model fields each search document is built from."""
+    return {
+        Question: {'title', 'content'},
+        Answer: {'question', 'content'},
+        Tag: {'name'},
+        get_user_model(): {'username', 'first_name', 'last_name', 'bio'},
+    }
+
+
+def touches_index(model, update_fields):
+    """Whether a save limited to `update_fields` changes the document."""
+    if update_fields is None:
+        return True
+    return not get_indexed_fields()[model].isdisjoint(update_fields)
+
+
+def normalize(text):
+    return ' '.join(text.lower().split())[:255]
+
+
+def build_document(instance, content_type=None):
+    title, body = get_document_builders()[type(instance)](instance)
+    return SearchDocument(
+        content_type=content_type or ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        title=title[:255],
+        body=body,
+        key=normalize(title),
+    )
+
+
+def index_instance(instance):
+    """Creates or refreshes the search document of a model instance."""
+    document = build_document(instance)
+    SearchDocument.objects.update_or_create(
+        content_type=document.content_type,
+        object_id=document.object_id,
+        defaults={
+            'title': document.title,
+            'body': document.body,
+            'key': document.key,
+        },
+    )
+
+
+def remove_instance(instance):
+    """Removes the search document of a model instance."""
+    content_type = ContentType.objects.get_for_model(instance)
+    SearchDocument.objects.filter(
+        content_type=content_type, object_id=instance.pk
+    ).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """Reindexes every searchable row from scratch."""
+    querysets = {
+        Question: Question.objects.prefetch_related('tags'),
+        Answer: Answer.objects.select_related('question'),
+        Tag: Tag.objects.all(),
+        get_user_model(): get_user_model().objects.all(),
+    }
+    SearchDocument.objects.all().delete()
+    total = 0
+    for model, queryset in querysets.items():
+        content_type = ContentType.objects.get_for_model(model)
+        last_pk = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk).order_by('pk')[:batch_size]
+            )
+            if not batch:
+                break
+            SearchDocument.objects.bulk_create(
+                [build_document(instance, content_type) for instance in batch]
+            )
+            total += len(batch)
+            last_pk = batch[-1].pk
+    return total
+
+
+def suggest(term, limit=None):
+    """Returns up to limit (type, id, title) rows whose title starts with term.
+
+    Answers are left out since their title is the question's. The prefix is
+    matched as a key range so the scan stays on the key index.
+    """
+    prefix = normalize(term)
+    if not prefix:
+        return []
+    content_types = ContentType.objects.get_for_models(
+        Question, Tag, get_user_model()
+    ).values()
+    suggestions = (
+        SearchDocument.objects
+        .filter(
+            key__gte=prefix,
+            key__lt=prefix + '\U0010ffff',
+            content_type__in=content_types,
+        )
+        .order_by('key')
+        .values_list('content_type__model', 'object_id', 'title')
+    )
+    return list(suggestions[:limit or settings.SEARCH_SUGGESTIONS_LIMIT])
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.models import Group
-from users.models import CustomUser
+from users.models import CustomUser, QueuedEmail
 
 admin.site.unregister(Group)
 
@@ -12,4 +12,11 @@ class CustomUserAdmin(admin.ModelAdmin):
         'is_active', 'is_staff', 'is_superuser'
     ]
     search_fields = ['username', 'first_name', 'last_name', 'email']
-    list_filter = ['is_active', 'is_staff', 'is_superuser']
\ No newline at end of file
+    list_filter = ['is_active', 'is_staff', 'is_superuser']
+
+
+@admin.register(QueuedEmail)
+class QueuedEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'to', 'status', 'attempts', 'created_at', 'sent_at']
+    search_fields = ['to', 'subject']
+    list_filter = ['status']
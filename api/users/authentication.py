@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from users.models import CustomUser
+
+TOKEN_USER_CLAIMS = ('username', 'is_active')
+
+
+def get_token_claims(user):
+    '''Claims `LoginSerializer` adds so the token can stand in for the user.'''
+    return {claim: getattr(user, claim) for claim in TOKEN_USER_CLAIMS}
+
+
+def get_token_user(user_id, claims):
+    '''Builds a user from token claims without touching the database.
+
+    Every other field is deferred, and the first access to any of them
+    loads the rest in a single query. The claims may be stale, so the user
+    can only be saved with `update_fields`.
+    '''
+    user = CustomUser.from_db(
+        None, ['id', *TOKEN_USER_CLAIMS],
+        [user_id, *(claims[claim] for claim in TOKEN_USER_CLAIMS)],
+    )
+    user._load_deferred_together = True
+    user._from_token = True
+    return user
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    '''JWT authentication with an optional stateless token-user mode.
+
+    With `JWT_TOKEN_USER` on, `request.user` is built from the token's
+    id, username and is_active claims, saving the user query on every
+    authenticated request. The claims are only as fresh as the token, so
+    a deactivated user keeps access until their tokens expire. Tokens
+    issued without the claims still load the user.
+    '''
+
+    def get_user(self, validated_token):
+        if not settings.JWT_TOKEN_USER:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        claims = {}
+        for claim in TOKEN_USER_CLAIMS:
+            if claim not in validated_token:
+                return super().get_user(validated_token)
+            claims[claim] = validated_token[claim]
+        if not claims['is_active']:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return get_token_user(user_id, claims)
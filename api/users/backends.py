@@ -1,16 +1,44 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import Value
+from django.db.models.functions import Lower
 
 
 class CustomBackend(ModelBackend):
-    '''Custom backend to allow login with username or password.'''
+    '''Custom backend to allow login with username or email.
 
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    Input containing `@` is looked up by email, anything else by username,
+    each through its case-insensitive index. Usernames may contain `@`
+    too, so an email miss falls back to the username index.
+    '''
+
+    def get_user_by(self, field, value):
         UserModel = get_user_model()
-        try:
-            user = UserModel.objects.get(Q(username=username) | Q(email=username))
-        except UserModel.DoesNotExist:
+        # Lower both sides in the database: SQLite's LOWER() only folds
+        # ASCII, so comparing with str.lower() misses non-ASCII logins.
+        users = list(
+            UserModel._default_manager
+            .alias(lookup=Lower(field))
+            .filter(lookup=Lower(Value(value)))
+            .order_by('id')
+        )
+        # Rows that differ only in case predate the indexes; prefer an
+        # exact match over the oldest one.
+        exact = [user for user in users if getattr(user, field) == value]
+        return (exact or users or [None])[0]
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None or password is None:
+            return None
+        user = None
+        if '@' in username:
+            user = self.get_user_by('email', username)
+        if user is None:
+            user = self.get_user_by('username', username)
+        if user is None:
+            # Run the hasher anyway so a missing user takes as long as a
+            # wrong password.
+            get_user_model()().set_password(password)
             return None
         if user.check_password(password) and self.user_can_authenticate(user):
-            return user
\ No newline at end of file
+            return user
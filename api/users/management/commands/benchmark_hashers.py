@@ -0,0 +1,78 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils.module_loading import import_string
+
+PASSWORD = 'b3nchm4rk-p4ssw0rd'
+
+# (label, hasher, settings overrides) tried unless --hasher narrows them.
+CONFIGURATIONS = [
+    ('pbkdf2 260k', 'users.hashers.PBKDF2PasswordHasher',
+     {'PASSWORD_PBKDF2_ITERATIONS': 260000}),
+    ('pbkdf2 100k', 'users.hashers.PBKDF2PasswordHasher',
+     {'PASSWORD_PBKDF2_ITERATIONS': 100000}),
+    ('scrypt n=2^14', 'users.hashers.ScryptPasswordHasher',
+     {'PASSWORD_SCRYPT_WORK_FACTOR': 2 ** 14}),
+    ('scrypt n=2^15', 'users.hashers.ScryptPasswordHasher',
+     {'PASSWORD_SCRYPT_WORK_FACTOR': 2 ** 15}),
+    ('argon2 t=2 m=100MiB', 'users.hashers.Argon2PasswordHasher',
+     {'PASSWORD_ARGON2_TIME_COST': 2, 'PASSWORD_ARGON2_MEMORY_COST': 102400,
+      'PASSWORD_ARGON2_PARALLELISM': 1}),
+]
+
+
+def verify_rate(path, overrides, duration):
+    '''Password checks per second in this process, one core's worth.'''
+    with override_settings(**overrides):
+        hasher = import_string(path)()
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        checks = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            hasher.verify(PASSWORD, encoded)
+            checks += 1
+        return checks / (time.perf_counter() - start)
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-tests password verification, the dominant cost of a login, '
+        'for each hasher configuration and reports logins per second per '
+        'core with one worker process per core.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=3)
+        parser.add_argument('--processes', type=int, default=os.cpu_count())
+        parser.add_argument(
+            '--hasher', action='append', dest='hashers',
+            help='Only run configurations whose label starts with this.',
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+        configurations = [
+            configuration for configuration in CONFIGURATIONS
+            if not options['hashers'] or
+            any(configuration[0].startswith(h) for h in options['hashers'])
+        ]
+        self.stdout.write(f'{processes} processes, {options["duration"]}s each')
+        with ProcessPoolExecutor(processes) as executor:
+            for label, path, overrides in configurations:
+                futures = [
+                    executor.submit(
+                        verify_rate, path, overrides, options['duration']
+                    )
+                    for _ in range(processes)
+                ]
+                try:
+                    rates = [future.result() for future in futures]
+                except (ImportError, ValueError) as exc:
+                    self.stderr.write(f'{label}: skipped ({exc})')
+                    continue
+                self.stdout.write(
+                    f'{label}: {sum(rates) / processes:.1f} logins/s per core, '
+                    f'{sum(rates):.1f} logins/s total'
+                )
@@ -0,0 +1,76 @@
+import time
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from users.backends import CustomBackend
+
+PASSWORD = 'b3nchm4rk-p4ssw0rd'
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the login lookup against the old username-or-email OR query '
+        'and measures full login throughput with the configured hasher. '
+        'Generated users are rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50000)
+        parser.add_argument('--lookups', type=int, default=2000)
+        parser.add_argument('--logins', type=int, default=20)
+
+    def generate(self, count):
+        password = make_password(PASSWORD)
+        get_user_model().objects.bulk_create(
+            [
+                get_user_model()(
+                    username=f'user{number}', email=f'user{number}@example.com',
+                    password=password, is_active=True,
+                )
+                for number in range(count)
+            ],
+            batch_size=5000,
+        )
+
+    def rate(self, run, count):
+        start = time.perf_counter()
+        for number in range(count):
+            run(number)
+        return count / (time.perf_counter() - start)
+
+    def handle(self, *args, **options):
+        users, lookups = options['users'], options['lookups']
+        logins = options['logins']
+        UserModel = get_user_model()
+        backend = CustomBackend()
+
+        def old_lookup(number):
+            name = f'user{number % users}@example.com'
+            UserModel.objects.filter(Q(username=name) | Q(email=name)).first()
+
+        def new_lookup(number):
+            backend.get_user_by('email', f'User{number % users}@example.com')
+
+        def login(number):
+            authenticate(username=f'user{number % users}', password=PASSWORD)
+
+        def missing_login(number):
+            authenticate(username=f'missing{number}', password=PASSWORD)
+
+        with transaction.atomic():
+            self.generate(users)
+            self.stdout.write(f'{users} users')
+            old = self.rate(old_lookup, lookups)
+            new = self.rate(new_lookup, lookups)
+            self.stdout.write(
+                f'lookup: OR query {old:.0f}/s, indexed {new:.0f}/s '
+                f'({new / old:.1f}x)'
+            )
+            found = self.rate(login, logins)
+            missing = self.rate(missing_login, logins)
+            self.stdout.write(
+                f'login: existing {found:.1f}/s, missing {missing:.1f}/s'
+            )
+            transaction.set_rollback(True)
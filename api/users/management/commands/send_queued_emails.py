@@ -0,0 +1,38 @@
+import time
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from users.utils import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends queued emails in batches over one reused connection. '
+        'Runs until the queue is empty, or forever with --loop.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--loop', action='store_true')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds to sleep when the queue is empty in --loop mode.',
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        total = 0
+        try:
+            while True:
+                # Opening up front keeps send_messages from reconnecting per
+                # batch; it is a no-op while the connection is alive.
+                connection.open()
+                sent = send_queued_emails(connection, options['batch_size'])
+                total += sent
+                if sent:
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(f'Sent {total} emails.'))
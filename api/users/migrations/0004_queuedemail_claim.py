@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-18 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_login_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedemail',
+            name='claim',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+    ]
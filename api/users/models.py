@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.db import models
 from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.mail import EmailMessage
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 
@@ -56,10 +59,34 @@ class CustomUser(AbstractUser):
         ordering = ['id']
         verbose_name = _('User')
         verbose_name_plural = _('Users')
+        indexes = [
+            # Back the case-insensitive login lookups in CustomBackend.
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
 
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        # Token users carry username and is_active as of the token; a full
+        # save would write those back over newer values.
+        from_token = getattr(self, '_from_token', False)
+        if from_token and kwargs.get('update_fields') is None:
+            raise ValueError(
+                'Users built from token claims must be saved with update_fields.'
+            )
+        super().save(*args, **kwargs)
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Token users (see users.authentication) defer every column but
+        # their claims; load them together instead of one query each.
+        deferred = self.get_deferred_fields()
+        if (fields is not None and getattr(self, '_load_deferred_together', False)
+                and deferred.issuperset(fields)):
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields)
+
     @property
     @admin.display(description=_('name'))
     def get_full_name(self):
@@ -70,3 +97,38 @@ class CustomUser(AbstractUser):
             return self.first_name
         else:
             return ''
+
+
+class QueuedEmail(models.Model):
+    '''Outgoing email, written in the request and sent by a worker.
+
+    Rows are created inside the request transaction, so a rolled back
+    signup never sends mail, and `send_queued_emails` delivers them later.
+    '''
+    PENDING = 'P'
+    SENT = 'S'
+    FAILED = 'F'
+    STATUS = ((PENDING, _('Pending')), (SENT, _('Sent')), (FAILED, _('Failed')))
+    to = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=1, choices=STATUS, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    claim = models.CharField(max_length=32, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = _('Queued email')
+        verbose_name_plural = _('Queued emails')
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+
+    def __str__(self):
+        return f'{self.subject} to {self.to}'
+
+    def to_message(self, connection=None):
+        return EmailMessage(
+            self.subject, self.body, to=[self.to], connection=connection
+        )
@@ -2,10 +2,13 @@ from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from django.utils.encoding import force_text
 from django.utils.http import urlsafe_base64_decode
 from rest_framework import serializers
 from rest_framework.exceptions import ParseError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from users.authentication import get_token_claims
 from users.models import CustomUser
 from users.tokens import email_confirmation_token
 from users.utils import send_confirmation_email
@@ -73,11 +76,14 @@ class UserCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         validated_data.pop('password2')
-        user = super(UserCreateSerializer, self).create(validated_data)
-        user.set_password(validated_data['password'])
-        user.save()
         domain = get_current_site(self.context['request'])
-        send_confirmation_email(user, domain)
+        # The confirmation email is queued in the same transaction, so a
+        # failed signup never sends one.
+        with transaction.atomic():
+            user = super(UserCreateSerializer, self).create(validated_data)
+            user.set_password(validated_data['password'])
+            user.save()
+            send_confirmation_email(user, domain)
         return user
 
 
@@ -97,6 +103,17 @@ class EmailConfirmSerializer(serializers.Serializer):
         return attrs
 
 
+class LoginSerializer(TokenObtainPairSerializer):
+    '''Adds the claims the token-user authentication mode reads.'''
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in get_token_claims(user).items():
+            token[claim] = value
+        return token
+
+
 class ChangePasswordSerializer(serializers.ModelSerializer):
     old_password = serializers.CharField(write_only=True, required=True)
     password = serializers.CharField(
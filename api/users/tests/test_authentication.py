@@ -0,0 +1,106 @@
+import json
+import os
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.models import Question
+from users.authentication import JWTAuthentication
+from users.serializers import LoginSerializer
+
+User = get_user_model()
+
+
+class JWTAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        base_dir = os.path.dirname(__file__)
+        file_path = os.path.join(base_dir, 'data.json')
+        with open(file_path) as file:
+            data = json.load(file)
+        self.user_data = data.get('user_data')
+        self.user = User.objects.create_user(**self.user_data)
+        self.user.is_active = True
+        self.user.save()
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, token):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user, _ = JWTAuthentication().authenticate(request)
+        return user
+
+    def test_login_claims(self):
+        url = reverse('users:login')
+        response = self.client.post(url, {
+            'username': self.user_data['username'],
+            'password': self.user_data['password'],
+        }, format='json')
+        token = JWTAuthentication().get_validated_token(response.data['access'])
+        self.assertEqual(token['username'], self.user.username)
+        self.assertTrue(token['is_active'])
+
+    def test_loads_user_by_default(self):
+        token = LoginSerializer.get_token(self.user).access_token
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertEqual(user.email, self.user.email)
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_token_user(self):
+        token = LoginSerializer.get_token(self.user).access_token
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.username, self.user.username)
+            self.assertTrue(user.is_authenticated)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+            self.assertEqual(user.date_joined, self.user.date_joined)
+        question = Question.objects.create(
+            user=user, title='Title', content='Content'
+        )
+        self.assertEqual(question.user_id, self.user.pk)
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_token_user_save(self):
+        token = LoginSerializer.get_token(self.user).access_token
+        user = self.authenticate(token)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        with self.assertRaises(ValueError):
+            user.save()
+        user.bio = 'Updated bio'
+        user.save(update_fields=['bio'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.bio, 'Updated bio')
+        self.assertFalse(self.user.is_active)
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_token_user_inactive(self):
+        token = LoginSerializer.get_token(self.user).access_token
+        token['is_active'] = False
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_token_without_claims(self):
+        token = RefreshToken.for_user(self.user).access_token
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertEqual(user.email, self.user.email)
+
+    @override_settings(JWT_TOKEN_USER=True)
+    def test_token_user_change_password(self):
+        token = LoginSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse('users:change-password', args=[self.user.pk])
+        response = self.client.put(url, {
+            'old_password': self.user_data['password'],
+            'password': 'N3w-passw0rd!',
+            'password2': 'N3w-passw0rd!',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('N3w-passw0rd!'))
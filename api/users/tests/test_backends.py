@@ -1,5 +1,6 @@
 import json
 import os
+from unittest import mock
 from django.contrib.auth import get_user_model, authenticate
 from django.test import TestCase
 
@@ -42,3 +43,44 @@ class CustomBackendTestCase(TestCase):
                 password=self.user_data['password']
             )
         )
+
+    def test_authenticate_case_insensitive(self):
+        for username in ('TEST', self.user_data['email'].upper()):
+            self.assertEqual(
+                authenticate(
+                    username=username, password=self.user_data['password']
+                ),
+                self.user
+            )
+
+    def test_authenticate_single_query(self):
+        with self.assertNumQueries(1):
+            authenticate(
+                username=self.user_data['email'],
+                password='wrong password'
+            )
+
+    def test_authenticate_non_ascii(self):
+        User = get_user_model()
+        user = User.objects.create_user(
+            username='Émile', email='émile@mail.com', password='p4ssw0rd',
+            is_active=True,
+        )
+        for username in ('Émile', 'ÉMILE', 'émile@mail.com', 'émile@MAIL.COM'):
+            self.assertEqual(
+                authenticate(username=username, password='p4ssw0rd'), user
+            )
+
+    def test_authenticate_username_with_at(self):
+        User = get_user_model()
+        user = User.objects.create_user(
+            username='at@home', email='other@mail.com', password='p4ssw0rd',
+            is_active=True,
+        )
+        self.assertEqual(authenticate(username='at@home', password='p4ssw0rd'), user)
+
+    def test_authenticate_missing_user_hashes(self):
+        User = get_user_model()
+        with mock.patch.object(User, 'set_password') as set_password:
+            authenticate(username='missing@mail.com', password='secret')
+        set_password.assert_called_once_with('secret')
@@ -0,0 +1,60 @@
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import identify_hasher
+from django.test import TestCase, override_settings
+from users.hashers import ScryptPasswordHasher
+
+User = get_user_model()
+HASHERS = [
+    'users.hashers.PBKDF2PasswordHasher',
+    'users.hashers.ScryptPasswordHasher',
+]
+
+
+@override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10)
+class ScryptPasswordHasherTestCase(TestCase):
+
+    def test_verify(self):
+        hasher = ScryptPasswordHasher()
+        encoded = hasher.encode('secret', hasher.salt())
+        self.assertTrue(encoded.startswith('scrypt$1024$'))
+        self.assertTrue(hasher.verify('secret', encoded))
+        self.assertFalse(hasher.verify('wrong', encoded))
+        self.assertFalse(hasher.must_update(encoded))
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 11):
+            self.assertTrue(hasher.must_update(encoded))
+            self.assertTrue(hasher.verify('secret', encoded))
+
+
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000, PASSWORD_HASHERS=HASHERS)
+class RehashOnLoginTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='test', email='test@mail.com', password='secret',
+            is_active=True,
+        )
+
+    def login(self, password='secret'):
+        user = authenticate(username='test', password=password)
+        self.user.refresh_from_db()
+        return user
+
+    def test_cost_change(self):
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login(), self.user)
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    def test_hasher_change(self):
+        hashers = list(reversed(HASHERS))
+        with override_settings(
+            PASSWORD_HASHERS=hashers, PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10
+        ):
+            self.assertEqual(self.login(), self.user)
+            self.assertEqual(identify_hasher(self.user.password).algorithm, 'scrypt')
+            self.assertEqual(self.login(), self.user)
+
+    def test_failed_login_keeps_hash(self):
+        password = self.user.password
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertIsNone(self.login('wrong'))
+        self.assertEqual(self.user.password, password)
@@ -15,6 +15,7 @@ from users.serializers import (
     EmailSerializer, PasswordResetSerializer
 )
 from users.tokens import email_confirmation_token
+from users.utils import send_queued_emails
 
 User = get_user_model()
 
@@ -50,6 +51,8 @@ class UserCreateSerializerTestCase(TestCase):
         )
         serializer.is_valid(raise_exception=True)
         serializer.create(serializer.validated_data)
+        self.assertEqual(len(mail.outbox), 0)
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(
             mail.outbox[0].subject, 'Django app account verification'
@@ -0,0 +1,104 @@
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from users.models import QueuedEmail
+from users.utils import (
+    claim_queued_emails, send_password_reset_email, send_queued_emails
+)
+
+User = get_user_model()
+
+
+class FailingEmailBackend(EmailBackend):
+    '''Refuses mail for addresses on the `failing` list.
+
+    Like SMTP, messages before the refused one are already delivered.
+    '''
+    failing = set()
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.failing:
+                raise OSError('Connection refused')
+            super().send_messages([message])
+        return len(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='users.tests.test_utils.FailingEmailBackend',
+    EMAIL_QUEUE_MAX_ATTEMPTS=2,
+)
+class SendQueuedEmailsTestCase(TestCase):
+
+    def setUp(self):
+        FailingEmailBackend.failing = set()
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@mail.com')
+            for i in range(3)
+        ]
+
+    def test_queued_until_sent(self):
+        send_password_reset_email(self.users[0], 'testserver')
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(send_queued_emails(), 1)
+        self.assertEqual(mail.outbox[0].to, ['user0@mail.com'])
+        email = QueuedEmail.objects.get()
+        self.assertEqual(email.status, QueuedEmail.SENT)
+        self.assertEqual(send_queued_emails(), 0)
+
+    def test_batch_size(self):
+        for user in self.users:
+            send_password_reset_email(user, 'testserver')
+        self.assertEqual(send_queued_emails(limit=2), 2)
+        self.assertEqual(send_queued_emails(limit=2), 1)
+
+    def test_retry_backoff(self):
+        FailingEmailBackend.failing = {'user1@mail.com'}
+        for user in self.users:
+            send_password_reset_email(user, 'testserver')
+        self.assertEqual(send_queued_emails(), 2)
+        failed = QueuedEmail.objects.get(to='user1@mail.com')
+        self.assertEqual(failed.status, QueuedEmail.PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('Connection refused', failed.last_error)
+        self.assertGreater(failed.next_attempt_at, timezone.now())
+        self.assertEqual(send_queued_emails(), 0)
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        send_queued_emails()
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, QueuedEmail.FAILED)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failure_midway_sends_once(self):
+        FailingEmailBackend.failing = {'user1@mail.com'}
+        for user in self.users:
+            send_password_reset_email(user, 'testserver')
+        send_queued_emails()
+        QueuedEmail.objects.update(next_attempt_at=timezone.now())
+        send_queued_emails()
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ['user0@mail.com', 'user2@mail.com'],
+        )
+
+    def test_claimed_emails_skipped(self):
+        for user in self.users:
+            send_password_reset_email(user, 'testserver')
+        claimed = claim_queued_emails(2, timezone.now())
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual(claimed[0].attempts, 1)
+        # Another worker only gets the unclaimed email.
+        self.assertEqual(send_queued_emails(), 1)
+        self.assertEqual(mail.outbox[0].to, ['user2@mail.com'])
+
+    def test_command(self):
+        for user in self.users:
+            send_password_reset_email(user, 'testserver')
+        out = StringIO()
+        call_command('send_queued_emails', batch_size=2, stdout=out)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertIn('Sent 3 emails.', out.getvalue())
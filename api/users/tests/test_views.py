@@ -1,5 +1,6 @@
 import json
 import os
+from unittest import mock
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.core import mail
@@ -10,6 +11,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase, APIRequestFactory
 from users.serializers import UserListSerializer, UserDetailSerializer
 from users.tokens import email_confirmation_token
+from users.utils import send_queued_emails
 
 User = get_user_model()
 
@@ -37,6 +39,14 @@ class UserViewsTestCase(APITestCase):
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_user_list_fields(self):
+        url = reverse('users:list')
+        response = self.client.get(url, {'fields': 'username,location'})
+        self.assertEqual(
+            response.data['results'],
+            [{'username': self.user.username, 'location': self.user.location}],
+        )
+
     def test_user_create(self):
         url = reverse('users:list')
         self.another_user_data['password2'] = self.another_user_data['password']
@@ -46,6 +56,16 @@ class UserViewsTestCase(APITestCase):
         self.assertEqual(User.objects.count(), 2)
         self.assertTrue(User.objects.filter(username='test2').exists())
 
+    def test_user_create_rolled_back(self):
+        url = reverse('users:list')
+        self.another_user_data['password2'] = self.another_user_data['password']
+        with mock.patch(
+            'users.serializers.send_confirmation_email', side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.client.post(url, self.another_user_data, format='json')
+        self.assertFalse(User.objects.filter(username='test2').exists())
+
     def test_user_list(self):
         self.client.force_authenticate(user=self.user)
         url = reverse('users:list')
@@ -58,6 +78,16 @@ class UserViewsTestCase(APITestCase):
         )
         self.assertEqual(response.data['results'], serializer.data)
 
+    def test_user_list_cursor(self):
+        for i in range(11):
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@mail.com')
+        url = reverse('users:list')
+        response = self.client.get(url, {'pagination': 'cursor'})
+        self.assertEqual(len(response.data['results']), 10)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+
     def test_user_detail(self):
         self.client.force_authenticate(user=self.user)
         url = reverse('users:detail', args=[self.user.id])
@@ -109,6 +139,8 @@ class UserViewsTestCase(APITestCase):
             response.data['message'],
             'We have sent you a link to reset your password.'
         )
+        self.assertEqual(len(mail.outbox), 0)
+        send_queued_emails()
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(
             mail.outbox[0].subject, 'Django app password reset'
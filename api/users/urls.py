@@ -12,7 +12,7 @@ urlpatterns = [
          name='change-password'),
     path('email-confirm/', views.EmailConfirmView.as_view(),
          name='email-confirm'),
-    path('login/', jwt_views.TokenObtainPairView().as_view(), name='login'),
+    path('login/', views.LoginView.as_view(), name='login'),
     path('login/refresh/', jwt_views.TokenRefreshView().as_view(),
          name='token-refresh'),
     path('password-reset/', views.PasswordReset.as_view(), name='password-reset'),
@@ -1,11 +1,20 @@
+from datetime import timedelta
+from uuid import uuid4
+from django.conf import settings
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.core.mail import get_connection
+from django.db import transaction
+from django.db.models import F
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
+from users.models import QueuedEmail
 from users.tokens import email_confirmation_token
 
 
 def send_email(user, domain, token, subject, template):
+    '''Queues the email; `send_queued_emails` delivers it after commit.'''
     context = {
         'user': user,
         'domain': domain,
@@ -13,7 +22,80 @@ def send_email(user, domain, token, subject, template):
         'token': token.make_token(user),
     }
     message = render_to_string(template, context)
-    user.email_user(subject, message)
+    QueuedEmail.objects.create(to=user.email, subject=subject, body=message)
+
+
+def get_retry_delay(attempts):
+    '''Exponential backoff after the given number of failed attempts.'''
+    return timedelta(
+        seconds=settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def claim_queued_emails(limit, now):
+    '''Claims up to `limit` due emails for this worker and returns them.
+
+    The claim pushes `next_attempt_at` past EMAIL_QUEUE_CLAIM_TIMEOUT, so the
+    rows are no longer due for other workers, and a crashed worker's emails
+    come back once it expires. The UPDATE rechecks that each row is still
+    due, which keeps claims exclusive where `skip_locked` does nothing
+    (SQLite).
+    '''
+    claim = uuid4().hex
+    with transaction.atomic():
+        email_ids = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=QueuedEmail.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        QueuedEmail.objects.filter(
+            id__in=email_ids, status=QueuedEmail.PENDING,
+            next_attempt_at__lte=now,
+        ).update(
+            claim=claim, attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(
+                seconds=settings.EMAIL_QUEUE_CLAIM_TIMEOUT
+            ),
+        )
+    return list(
+        QueuedEmail.objects.filter(id__in=email_ids, claim=claim).order_by('id')
+    )
+
+
+def send_queued_emails(connection=None, limit=None):
+    '''Sends due queued emails over one connection, returning how many.
+
+    Emails are claimed in a short transaction and then sent one at a time,
+    outside of it, recording each outcome as soon as it is known so a
+    failure midway never resends the ones already delivered. Failed emails
+    are pushed back with exponential backoff until EMAIL_QUEUE_MAX_ATTEMPTS.
+    '''
+    connection = connection or get_connection()
+    limit = limit or settings.EMAIL_QUEUE_BATCH_SIZE
+    sent = 0
+    for email in claim_queued_emails(limit, timezone.now()):
+        try:
+            connection.send_messages([email.to_message()])
+        except Exception as exc:
+            # Drop a possibly broken connection; the next send reopens it.
+            connection.close()
+            email.last_error = repr(exc)
+            if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+                email.status = QueuedEmail.FAILED
+            else:
+                email.next_attempt_at = (
+                    timezone.now() + get_retry_delay(email.attempts)
+                )
+        else:
+            email.status = QueuedEmail.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            sent += 1
+        email.save(update_fields=[
+            'status', 'next_attempt_at', 'last_error', 'sent_at'
+        ])
+    return sent
 
 
 def send_confirmation_email(user, domain):
@@ -2,19 +2,25 @@ from django.contrib.sites.shortcuts import get_current_site
 from rest_framework import generics, mixins, status, viewsets
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView
+from core.fieldsets import SparseFieldsetMixin
+from core.pagination import CursorPaginationMixin
+from core.replicas import ReplicaReadMixin
 from users.models import CustomUser
 from users.permissions import UserAccessOrReadOnly
 from users.serializers import (
     UserListSerializer, UserCreateSerializer, UserDetailSerializer,
     EmailConfirmSerializer, ChangePasswordSerializer, EmailSerializer,
-    PasswordResetSerializer
+    PasswordResetSerializer, LoginSerializer
 )
 from users.utils import send_password_reset_email
 
 
-class UserListViewSet(viewsets.ModelViewSet):
+class UserListViewSet(ReplicaReadMixin, SparseFieldsetMixin,
+                      CursorPaginationMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.all()
     permission_classes = [AllowAny]
+    cursor_ordering = ('id',)
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -23,7 +29,8 @@ class UserListViewSet(viewsets.ModelViewSet):
             return UserCreateSerializer
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(ReplicaReadMixin, SparseFieldsetMixin,
+                     generics.RetrieveUpdateDestroyAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserDetailSerializer
     permission_classes = [UserAccessOrReadOnly]
@@ -45,6 +52,10 @@ class EmailConfirmView(generics.GenericAPIView):
         )
 
 
+class LoginView(TokenObtainPairView):
+    serializer_class = LoginSerializer
+
+
 class ChangePasswordView(generics.UpdateAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = ChangePasswordSerializer